@@ -7,7 +7,9 @@ from .errors import (
     UnsupportedValueType,
     ValidationError,
 )
+from .frozenconfig import FrozenConfig, FrozenDictConfig, FrozenListConfig
 from .listconfig import ListConfig
+from .merge_plan import MergePlan
 from .nodes import (
     AnyNode,
     BooleanNode,
@@ -39,6 +41,10 @@ __all__ = [
     "Container",
     "ListConfig",
     "DictConfig",
+    "FrozenConfig",
+    "FrozenDictConfig",
+    "FrozenListConfig",
+    "MergePlan",
     "OmegaConf",
     "Resolver",
     "flag_override",
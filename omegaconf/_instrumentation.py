@@ -0,0 +1,102 @@
+"""Opt-in statistics about resolver calls and interpolation resolution."""
+import threading
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, List, Optional
+
+# Maximum number of latency samples kept per resolver for the percentiles.
+LATENCY_SAMPLES = 10000
+
+
+def _percentile(samples: List[float], percent: int) -> float:
+    if len(samples) == 0:
+        return 0.0
+    # nearest rank
+    index = max(0, (len(samples) * percent + 99) // 100 - 1)
+    return samples[index]
+
+
+@dataclass
+class ResolverStats:
+    calls: int = 0
+    cache_hits: int = 0
+    cache_misses: int = 0
+    total_time: float = 0.0
+    # most recent call latencies in seconds
+    latencies: Deque[float] = field(
+        default_factory=lambda: deque(maxlen=LATENCY_SAMPLES)
+    )
+
+    def to_dict(self) -> Dict[str, Any]:
+        samples = sorted(self.latencies)
+        return {
+            "calls": self.calls,
+            "cache_hits": self.cache_hits,
+            "cache_misses": self.cache_misses,
+            "total_time": self.total_time,
+            "p50": _percentile(samples, 50),
+            "p90": _percentile(samples, 90),
+            "p99": _percentile(samples, 99),
+        }
+
+
+class Recorder:
+    """
+    Collects statistics while instrumentation is enabled,
+    see OmegaConf.set_instrumentation().
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        # interpolation depth of the current thread
+        self._local = threading.local()
+        self.resolvers: Dict[str, ResolverStats] = {}
+        self.interpolations = 0
+        self.max_depth = 0
+
+    def _resolver_stats(self, name: str) -> ResolverStats:
+        stats = self.resolvers.get(name)
+        if stats is None:
+            stats = self.resolvers[name] = ResolverStats()
+        return stats
+
+    def record_lookup(self, name: str, hit: bool) -> None:
+        with self._lock:
+            stats = self._resolver_stats(name)
+            if hit:
+                stats.cache_hits += 1
+            else:
+                stats.cache_misses += 1
+
+    def record_call(self, name: str, elapsed: float) -> None:
+        with self._lock:
+            stats = self._resolver_stats(name)
+            stats.calls += 1
+            stats.total_time += elapsed
+            stats.latencies.append(elapsed)
+
+    def enter_interpolation(self) -> None:
+        depth = getattr(self._local, "depth", 0) + 1
+        self._local.depth = depth
+        with self._lock:
+            self.interpolations += 1
+            self.max_depth = max(self.max_depth, depth)
+
+    def exit_interpolation(self) -> None:
+        self._local.depth -= 1
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "resolvers": {
+                    name: stats.to_dict() for name, stats in self.resolvers.items()
+                },
+                "interpolations": {
+                    "count": self.interpolations,
+                    "max_depth": self.max_depth,
+                },
+            }
+
+
+# The active recorder, None when instrumentation is disabled.
+recorder: Optional[Recorder] = None
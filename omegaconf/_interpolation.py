@@ -0,0 +1,86 @@
+"""Parsing of interpolation strings such as "${foo.bar}" or "http://${host}:${port}"."""
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Callable, List, Optional, Tuple, Union
+
+# Maximum number of distinct strings kept in the parse cache.
+PARSE_CACHE_SIZE = 16384
+
+_INTERPOLATION_RE = re.compile(r"\${(\w+:)?([\w\.%_ \\,-]*?)}")
+
+
+@dataclass(frozen=True)
+class InterpolationRef:
+    """
+    A single ${...} reference inside a string.
+    inter_type is the resolver name ("env" in "${env:HOME}"), or None for a reference
+    to another config node ("${foo.bar}").
+    """
+
+    inter_type: Optional[str]
+    inter_key: str
+
+
+@dataclass(frozen=True)
+class ParsedInterpolation:
+    """
+    The parsed form of a string containing interpolations.
+    segments alternates literal text (str) and references (InterpolationRef),
+    empty literals are omitted.
+    """
+
+    segments: Tuple[Union[str, InterpolationRef], ...]
+    refs: Tuple[InterpolationRef, ...]
+
+    def is_single_ref(self) -> bool:
+        """True if the whole string is exactly one reference, e.g. "${foo}" """
+        return len(self.segments) == 1 and len(self.refs) == 1
+
+    def render(self, resolve: Callable[[InterpolationRef], Any]) -> str:
+        """
+        Renders the string, replacing each reference with str() of its resolved value.
+        :param resolve: called with each reference, returns the value to substitute
+        """
+        return "".join(
+            segment if isinstance(segment, str) else str(resolve(segment))
+            for segment in self.segments
+        )
+
+
+def _parse(value: str) -> Optional[ParsedInterpolation]:
+    segments: List[Union[str, InterpolationRef]] = []
+    refs: List[InterpolationRef] = []
+    last_index = 0
+    for match in _INTERPOLATION_RE.finditer(value):
+        if match.start(0) > last_index:
+            segments.append(value[last_index : match.start(0)])
+        inter_type = match.group(1)
+        ref = InterpolationRef(
+            inter_type=inter_type[0:-1] if inter_type is not None else None,
+            inter_key=match.group(2),
+        )
+        segments.append(ref)
+        refs.append(ref)
+        last_index = match.end(0)
+
+    if len(refs) == 0:
+        return None
+    if last_index < len(value):
+        segments.append(value[last_index:])
+    return ParsedInterpolation(segments=tuple(segments), refs=tuple(refs))
+
+
+_parse_cached = lru_cache(maxsize=PARSE_CACHE_SIZE)(_parse)
+
+
+def parse_interpolation(value: str) -> Optional[ParsedInterpolation]:
+    """
+    Parse a string into literal segments and interpolation references.
+    Results are cached by the input string.
+    :param value: string to parse
+    :return: the parsed interpolation, or None if value contains no interpolation
+    """
+    if "${" not in value:
+        return None
+    return _parse_cached(value)
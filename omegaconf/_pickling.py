@@ -0,0 +1,239 @@
+"""
+Compact pickled form of configs.
+
+A config is pickled as its primitive content (dicts, lists and the values of its value
+nodes) and a side table with the types, optionality and flags of the nodes that differ
+from what OmegaConf.create() makes of the primitive content: nodes are numbered in
+depth first order and the table maps the numbers of these nodes to their spec.
+Unpickling creates the nodes directly from the content and the specs, the values were
+validated when they were set and are not validated again.
+"""
+import dataclasses
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Dict, Optional, Tuple, Type
+
+from ._interpolation import parse_interpolation
+from ._utils import ValueKind
+from .base import Container, ContainerMetadata, Metadata, Node
+from .nodes import AnyNode, EnumNode, ValueNode
+
+if TYPE_CHECKING:
+    from .basecontainer import BaseContainer  # noqa F401
+
+# (node type, metadata type, metadata values without the key, extra) where extra is
+# the enum type of an EnumNode and (kind, lazy) for a container.
+_Spec = Tuple[Type[Node], Type[Metadata], Tuple[Any, ...], Any]
+
+
+# metadata type -> names of its fields, without the key
+_fields: Dict[Type[Metadata], Tuple[str, ...]] = {}
+
+
+def _metadata_fields(metadata_type: Type[Metadata]) -> Tuple[str, ...]:
+    fields = _fields.get(metadata_type)
+    if fields is None:
+        fields = _fields[metadata_type] = tuple(
+            f.name for f in dataclasses.fields(metadata_type) if f.name != "key"
+        )
+    return fields
+
+
+@lru_cache(maxsize=None)
+def _default_spec(is_dict: bool) -> _Spec:
+    """spec of a container created from a primitive dict or list"""
+    from .dictconfig import DictConfig
+    from .listconfig import ListConfig
+
+    node = DictConfig(content={}) if is_dict else ListConfig(content=[])
+    return _spec_of(node, (ValueKind.VALUE, False))
+
+
+def _spec_of(node: Node, extra: Any) -> _Spec:
+    metadata = node._metadata
+    values = tuple(getattr(metadata, name) for name in _metadata_fields(type(metadata)))
+    if metadata.flags is not None:
+        # hashable, flags are restored as a dict
+        i = _metadata_fields(type(metadata)).index("flags")
+        values = values[:i] + (tuple(metadata.flags.items()),) + values[i + 1 :]
+    return type(node), type(metadata), values, extra
+
+
+def _str_kind(value: str) -> ValueKind:
+    """get_value_kind() of a string value"""
+    if value == "???":
+        return ValueKind.MANDATORY_MISSING
+    parsed = parse_interpolation(value)
+    if parsed is None:
+        return ValueKind.VALUE
+    if parsed.is_single_ref():
+        return ValueKind.INTERPOLATION
+    return ValueKind.STR_INTERPOLATION
+
+
+def pickle_config(cfg: "BaseContainer") -> Tuple[Any, Dict[int, _Spec]]:
+    """
+    :param cfg: the config to pickle
+    :return: the primitive content of cfg and the side table of its nodes, the spec
+             of cfg itself is always in the table
+    """
+    from .basecontainer import BaseContainer, CopiedContent, LazyContent, OverlayContent
+
+    types: Dict[int, _Spec] = {}
+    # identical specs are pickled once
+    specs: Dict[_Spec, _Spec] = {}
+    count = 0
+
+    def add_spec(index: int, spec: _Spec) -> _Spec:
+        try:
+            spec = specs.setdefault(spec, spec)
+        except TypeError:
+            pass
+        types[index] = spec
+        return spec
+
+    def encode(node: Node) -> Any:
+        nonlocal count
+        index = count
+        count += 1
+        if isinstance(node, ValueNode):
+            metadata = node._metadata
+            if (
+                type(node) is not AnyNode
+                or not metadata.optional
+                or metadata.flags is not None
+            ):
+                extra = node.enum_type if isinstance(node, EnumNode) else None
+                add_spec(index, _spec_of(node, extra))
+            return node._val
+
+        # the nodes of a copy are read from the config it shares them with
+        assert isinstance(node, BaseContainer)
+        holder = node
+        content = holder.__dict__["_content"]
+        while isinstance(content, CopiedContent):
+            holder = content._raw
+            content = holder.__dict__["_content"]
+        if isinstance(content, OverlayContent):
+            content = holder._materialize()
+        lazy = type(content) is LazyContent
+        spec = add_spec(index, _spec_of(node, (node.__dict__["_kind"], lazy)))
+        if lazy:
+            return content._raw
+        if isinstance(content, dict):
+            res: Any = {key: encode(child) for key, child in content.items()}
+        elif isinstance(content, list):
+            res = [encode(child) for child in content]
+        else:
+            return content
+        if index != 0 and spec == _default_spec(isinstance(res, dict)):
+            del types[index]
+        return res
+
+    return encode(cfg), types
+
+
+def unpickle_config(
+    content: Any,
+    types: Dict[int, _Spec],
+    key: Any,
+    parent: Optional[Container],
+    caches: Tuple[bool, bool],
+) -> "BaseContainer":
+    """
+    Creates a config pickled by pickle_config().
+    :param content: primitive content of the config
+    :param types: specs of the nodes
+    :param key: key of the config in its parent
+    :param parent: parent of the config
+    :param caches: whether the resolved cache and the path index are enabled
+    """
+    from .basecontainer import BaseContainer, LazyContent, PathIndex, ResolvedCache
+
+    VALUE = ValueKind.VALUE
+    default_dict = _default_spec(True)
+    default_list = _default_spec(False)
+    # id of a spec -> the spec with the metadata values as a dict, and whether it
+    # is the spec of a value node
+    prepared: Dict[int, Tuple[Any, Any, Dict[str, Any], Any, bool]] = {}
+    count = 1
+
+    def create_node(spec: _Spec, value: Any, key: Any, parent: Any) -> Node:
+        entry = prepared.get(id(spec))
+        if entry is None:
+            node_type, metadata_type, values, extra = spec
+            fields = dict(zip(_metadata_fields(metadata_type), values))
+            is_value = issubclass(node_type, ValueNode)
+            entry = (node_type, metadata_type, fields, extra, is_value)
+            prepared[id(spec)] = entry
+        node_type, metadata_type, fields, extra, is_value = entry
+        metadata = object.__new__(metadata_type)
+        metadata.__dict__ = fields.copy()
+        metadata.key = key
+        if metadata.flags is not None:
+            metadata.flags = dict(metadata.flags)
+
+        if is_value:
+            node: ValueNode = object.__new__(node_type)
+            node._metadata = metadata
+            node._parent = parent
+            node._hierarchy_cache = None
+            node._val = value
+            node._kind = _str_kind(value) if type(value) is str else VALUE
+            if extra is not None:
+                assert isinstance(node, EnumNode)
+                node.enum_type = extra
+            return node
+
+        assert isinstance(metadata, ContainerMetadata)
+        container: BaseContainer = object.__new__(node_type)
+        BaseContainer.__init__(container, parent=parent, metadata=metadata)
+        kind, lazy = extra
+        container.__dict__["_kind"] = kind
+        if lazy:
+            value = LazyContent(container, value)
+        elif type(value) is dict or type(value) is list:
+            value = create_content(container, value)
+        container.__dict__["_content"] = value
+        return container
+
+    def create_content(container: BaseContainer, value: Any) -> Any:
+        nonlocal count
+        content: Any
+        if type(value) is dict:
+            content = {}
+            items: Any = value.items()
+        else:
+            content = [None] * len(value)
+            items = enumerate(value)
+        for key, item in items:
+            spec = types.get(count)
+            count += 1
+            if spec is None:
+                item_type = type(item)
+                if item_type is dict:
+                    spec = default_dict
+                elif item_type is list:
+                    spec = default_list
+                else:
+                    # a value of an untyped config, the most common node
+                    metadata = object.__new__(Metadata)
+                    metadata.__dict__ = {"optional": True, "key": key, "flags": None}
+                    node = object.__new__(AnyNode)
+                    node._metadata = metadata
+                    node._parent = container
+                    node._hierarchy_cache = None
+                    node._val = item
+                    node._kind = _str_kind(item) if item_type is str else VALUE
+                    content[key] = node
+                    continue
+            content[key] = create_node(spec, item, key, container)
+        return content
+
+    res = create_node(types[0], content, key, parent)
+    assert isinstance(res, BaseContainer)
+    resolved_cache, path_index = caches
+    if resolved_cache:
+        res.__dict__["_resolved_cache"] = ResolvedCache()
+    if path_index:
+        res.__dict__["_path_index"] = PathIndex()
+    return res
@@ -0,0 +1,352 @@
+"""Bulk resolution of all the interpolations in a config tree."""
+import asyncio
+import copy
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Any, Awaitable, Dict, List, Optional, Tuple, Union
+
+from . import _instrumentation
+from ._interpolation import InterpolationRef, parse_interpolation
+from ._resolver_cache import CachingResolver
+from ._utils import ValueKind, _get_value, get_value_kind
+from .base import Container, Node, _is_missing_value
+from .errors import InterpolationCycleError, MissingMandatoryValue, ReadonlyConfigError
+from .nodes import ValueNode
+
+
+def _full_key(node: Node) -> str:
+    parent = node._get_parent()
+    if parent is None:
+        return ""
+    return parent._get_full_key(str(node._key()))
+
+
+class FailedCall:
+    """
+    A resolver call made ahead of time that raised an exception. The exception is
+    raised where the result of the call is used.
+    """
+
+    __slots__ = ("error",)
+
+    def __init__(self, error: BaseException) -> None:
+        self.error = error
+
+
+class BulkResolver:
+    """
+    Resolves the interpolations of a config in one pass.
+    Interpolation references form a dependency graph between nodes. The graph is
+    walked depth first, which resolves every node after the nodes it depends on
+    (a topological order). Each interpolation node is resolved at most once and the
+    result is memoized, so a node referenced many times is only resolved once.
+    Cycles in the graph are reported with InterpolationCycleError.
+    Results of resolver calls computed ahead of time (see call_async_resolvers) can be
+    passed in resolver_results, keyed by (resolver name, argument string). Calls that
+    failed are passed as a FailedCall and are not retried.
+    """
+
+    def __init__(
+        self, resolver_results: Optional[Dict[Tuple[str, str], Any]] = None
+    ) -> None:
+        self._resolver_results = resolver_results or {}
+        # id(node) -> (node, resolved value). The node is kept to pin its id.
+        self._resolved: Dict[int, Tuple[Node, Any]] = {}
+        # Nodes currently being resolved, in resolution order.
+        self._in_progress: Dict[int, Node] = {}
+        # Containers whose nodes are currently being resolved, outermost first.
+        self._containers: Dict[int, Container] = {}
+
+    def enter_container(self, cfg: Container) -> None:
+        """
+        Marks cfg as being walked: an interpolation resolving to it while its nodes
+        are resolved is a cycle. Must be followed by exit_container(cfg).
+        """
+        self._containers[id(cfg)] = cfg
+
+    def exit_container(self, cfg: Container) -> None:
+        del self._containers[id(cfg)]
+
+    def _check_container_cycle(self, node: Node, resolved: Any) -> None:
+        if isinstance(resolved, Container) and id(resolved) in self._containers:
+            ids = list(self._containers.keys())
+            containers = list(self._containers.values())[ids.index(id(resolved)) :]
+            raise InterpolationCycleError(
+                "Interpolation cycle detected: {}".format(
+                    " -> ".join(_full_key(n) for n in containers + [node, resolved])
+                )
+            )
+
+    def resolve(self, node: Node) -> Any:
+        """
+        Resolves an interpolation node.
+        :param node: a node holding an interpolation
+        :return: the node the interpolation evaluates to, or a str for string
+        interpolations
+        """
+        node_id = id(node)
+        if node_id in self._resolved:
+            return self._resolved[node_id][1]
+
+        if node_id in self._in_progress:
+            nodes = list(self._in_progress.values())
+            cycle = nodes[nodes.index(node) :] + [node]
+            raise InterpolationCycleError(
+                "Interpolation cycle detected: {}".format(
+                    " -> ".join(_full_key(n) for n in cycle)
+                )
+            )
+
+        self._in_progress[node_id] = node
+        try:
+            resolved = self._resolve_node(node)
+        finally:
+            del self._in_progress[node_id]
+        self._resolved[node_id] = (node, resolved)
+        return resolved
+
+    def resolve_value(self, parent: Container, key: Any, node: Node) -> Any:
+        """
+        Returns the resolved primitive value of a node, following the same rules as
+        reading the value from the parent container.
+        :param parent: container holding the node
+        :param key: key of the node in parent
+        :param node: the node
+        """
+        if isinstance(node, ValueNode) and node._is_interpolation():
+            resolved = self.resolve(node)
+            self._check_container_cycle(node, resolved)
+        else:
+            resolved = node
+        if get_value_kind(resolved) == ValueKind.MANDATORY_MISSING:
+            raise MissingMandatoryValue(parent._get_full_key(str(key)))
+        return _get_value(resolved)
+
+    def resolve_in_place(self, cfg: Container) -> None:
+        """
+        Replaces all the interpolations in cfg with their resolved values.
+        :param cfg: the config to resolve
+        """
+        from .dictconfig import DictConfig
+
+        if cfg._is_none() or cfg._is_missing() or cfg._is_interpolation():
+            return
+
+        keys: List[Any]
+        if isinstance(cfg, DictConfig):
+            keys = list(cfg.__dict__["_content"].keys())
+        else:
+            keys = list(range(len(cfg.__dict__["_content"])))
+
+        self.enter_container(cfg)
+        try:
+            for key in keys:
+                self._resolve_key_in_place(cfg, key)
+        finally:
+            self.exit_container(cfg)
+
+    def _resolve_key_in_place(self, cfg: Container, key: Any) -> None:
+        node = cfg.__dict__["_content"][key]
+        if node._is_interpolation():
+            if node._get_flag("readonly"):
+                raise ReadonlyConfigError(cfg._get_full_key(str(key)))
+            resolved = self.resolve(node)
+            self._check_container_cycle(node, resolved)
+            if isinstance(resolved, Container):
+                # keep the parent as is, the copy is re-parented on assignment
+                memo = {id(resolved._get_parent()): resolved._get_parent()}
+                value = copy.deepcopy(resolved, memo=memo)
+                if isinstance(node, Container):
+                    node._set_value(value)
+                else:
+                    cfg[key] = value
+            else:
+                node._set_value(_get_value(resolved))
+
+        node = cfg.__dict__["_content"][key]
+        if isinstance(node, Container):
+            self.resolve_in_place(node)
+
+    def _resolve_node(self, node: Node) -> Any:
+        value = node._value()
+        parsed = parse_interpolation(value)
+        assert parsed is not None
+        node_parent = node._get_parent()
+        assert node_parent is not None
+        # bound to a non-optional local, the lambda below does not see the narrowing
+        parent: Container = node_parent
+        key = node._key()
+
+        if node._kind == ValueKind.INTERPOLATION:
+            return self._resolve_ref(parent, key, parsed.refs[0])
+
+        assert node._kind == ValueKind.STR_INTERPOLATION
+        return parsed.render(lambda ref: self._resolve_ref(parent, key, ref))
+
+    def _resolve_ref(self, parent: Container, key: Any, ref: InterpolationRef) -> Any:
+        result_key = None
+        if ref.inter_type is not None and ref.inter_type != "str":
+            result_key = (ref.inter_type, ref.inter_key)
+            if result_key not in self._resolver_results:
+                # resolver calls are cached (and recorded) by _resolve_interpolation
+                return parent._resolve_interpolation(
+                    key=key,
+                    inter_type=ref.inter_type,
+                    inter_key=ref.inter_key,
+                    throw_on_missing=True,
+                )
+
+        recorder = _instrumentation.recorder
+        if recorder is not None:
+            recorder.enter_interpolation()
+        try:
+            if result_key is not None:
+                result = self._resolver_results[result_key]
+                if isinstance(result, FailedCall):
+                    raise result.error
+                return parent._resolver_result_node(key, result)
+            return self._resolve_node_ref(parent, key, ref)
+        finally:
+            if recorder is not None:
+                recorder.exit_interpolation()
+
+    def _resolve_node_ref(
+        self, parent: Container, key: Any, ref: InterpolationRef
+    ) -> Any:
+        target_parent, value = self._select(parent._get_root(), ref.inter_key)
+        if value is None:
+            raise KeyError("str interpolation key '{}' not found".format(ref.inter_key))
+        if isinstance(value, ValueNode) and value._is_interpolation():
+            value = self.resolve(value)
+        if _is_missing_value(value):
+            assert target_parent is not None
+            raise MissingMandatoryValue(target_parent._get_full_key(str(key)))
+        return value
+
+    def _select(
+        self, root: Container, key: str
+    ) -> Tuple[Optional[Container], Optional[Node]]:
+        from .omegaconf import _select_one
+
+        if key == "":
+            return root, root
+
+        split = key.split(".")
+        cur: Union[Container, Node, None] = root
+        for k in split[0:-1]:
+            if cur is None:
+                return None, None
+            assert isinstance(cur, Container)
+            cur, _ = _select_one(cur, k)
+            assert cur is None or isinstance(cur, Container)
+
+        if cur is None:
+            return None, None
+        assert isinstance(cur, Container)
+        value, _ = _select_one(cur, split[-1])
+        return cur, value
+
+
+def collect_resolver_calls(cfg: Container) -> List[Tuple[str, str]]:
+    """
+    Collects the resolver calls made by the interpolations in a config.
+    :param cfg: the config
+    :return: distinct (resolver name, argument string) pairs, in config order
+    """
+    from .basecontainer import BaseContainer
+
+    # used as an ordered set
+    calls: Dict[Tuple[str, str], None] = {}
+
+    def collect(node: Node) -> None:
+        if node._is_interpolation():
+            if isinstance(node, Container):
+                value = node.__dict__["_content"]
+            else:
+                value = node._value()
+            parsed = parse_interpolation(value)
+            assert parsed is not None
+            for ref in parsed.refs:
+                if ref.inter_type is not None and ref.inter_type != "str":
+                    calls[(ref.inter_type, ref.inter_key)] = None
+        elif isinstance(node, BaseContainer):
+            content = node._materialize()
+            if isinstance(content, dict):
+                children = list(content.values())
+            elif isinstance(content, list):
+                children = content
+            else:
+                children = []
+            for child in children:
+                collect(child)
+
+    collect(cfg)
+    return list(calls.keys())
+
+
+def call_resolvers(cfg: Container, executor: Executor) -> Dict[Tuple[str, str], Any]:
+    """
+    Calls the resolvers used by the interpolations in cfg in parallel on the executor.
+    Results are also stored in the resolver caches of the config cfg belongs to.
+    Resolvers used by interpolations outside of cfg are not called.
+    :param cfg: the config (or any node in it)
+    :param executor: executor running the resolver calls
+    :return: (resolver name, argument string) -> result or FailedCall, in config order
+    """
+    from .omegaconf import OmegaConf
+
+    root = cfg._get_root()
+    futures = {}
+    for name, inter_key in collect_resolver_calls(cfg):
+        resolver = OmegaConf.get_resolver(name)
+        if resolver is not None:
+            futures[(name, inter_key)] = executor.submit(resolver, root, inter_key)
+
+    results: Dict[Tuple[str, str], Any] = {}
+    for call, future in futures.items():
+        error = future.exception()
+        results[call] = future.result() if error is None else FailedCall(error)
+    return results
+
+
+def prefetching_resolver(
+    cfg: Container, max_workers: Optional[int], executor: Optional[Executor]
+) -> BulkResolver:
+    """
+    Creates a BulkResolver for cfg. If max_workers or executor is provided, the
+    resolver calls are made in parallel beforehand.
+    :param cfg: the config to resolve
+    :param max_workers: number of threads used to call resolvers
+    :param executor: executor used to call resolvers, takes precedence over max_workers
+    """
+    if executor is not None:
+        return BulkResolver(resolver_results=call_resolvers(cfg, executor))
+    if max_workers is not None:
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            return BulkResolver(resolver_results=call_resolvers(cfg, pool))
+    return BulkResolver()
+
+
+async def call_async_resolvers(cfg: Container) -> Dict[Tuple[str, str], Any]:
+    """
+    Concurrently calls the async resolvers used by the interpolations in the config
+    that cfg belongs to. Results are also stored in the resolver caches.
+    The whole config is covered because interpolations in cfg may reference nodes
+    outside of it, and async resolvers cannot be called once resolution has started.
+    :param cfg: the config (or any node in it)
+    :return: (resolver name, argument string) -> result or FailedCall
+    """
+    from .omegaconf import OmegaConf
+
+    root = cfg._get_root()
+    keys: List[Tuple[str, str]] = []
+    calls: List[Awaitable[Any]] = []
+    for name, inter_key in collect_resolver_calls(root):
+        resolver = OmegaConf.get_resolver(name)
+        if isinstance(resolver, CachingResolver) and resolver.is_async():
+            keys.append((name, inter_key))
+            calls.append(resolver.acall(root, inter_key))
+    values = await asyncio.gather(*calls, return_exceptions=True)
+    return {
+        key: FailedCall(value) if isinstance(value, BaseException) else value
+        for key, value in zip(keys, values)
+    }
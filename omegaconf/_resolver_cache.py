@@ -0,0 +1,228 @@
+"""Registered resolvers and the caches of their results."""
+import asyncio
+import inspect
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Coroutine
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterator,
+    MutableMapping,
+    Optional,
+    Tuple,
+)
+
+from . import _instrumentation
+
+
+class ResolverCache(MutableMapping[str, Any]):
+    """
+    Cache of the results of a single resolver, keyed by the resolver argument string.
+    Entries are evicted in least recently used order once max_size is reached, and
+    expire ttl seconds after they were stored.
+    lookup() counts hits and misses, evictions include expired entries.
+    """
+
+    def __init__(
+        self,
+        max_size: Optional[int] = None,
+        ttl: Optional[float] = None,
+        content: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        assert max_size is None or max_size > 0, "max_size must be positive"
+        assert ttl is None or ttl > 0, "ttl must be positive"
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # key -> (expiration time or None, value)
+        self._entries: "OrderedDict[str, Tuple[Optional[float], Any]]" = OrderedDict()
+        if content is not None:
+            for key, value in content.items():
+                self[key] = value
+
+    def lookup(self, key: str) -> Tuple[bool, Any]:
+        """
+        Looks up a key, counting a hit or a miss.
+        :return: (True, value) if the key is cached, (False, None) otherwise
+        """
+        if key in self:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return True, self._entries[key][1]
+        self.misses += 1
+        return False, None
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "size": len(self._entries),
+        }
+
+    def __contains__(self, key: object) -> bool:
+        entry = self._entries.get(key)  # type: ignore
+        if entry is None:
+            return False
+        expires = entry[0]
+        if expires is not None and expires <= time.monotonic():
+            del self._entries[key]  # type: ignore
+            self.evictions += 1
+            return False
+        return True
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self:
+            raise KeyError(key)
+        return self._entries[key][1]
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        expires = None if self.ttl is None else time.monotonic() + self.ttl
+        self._entries[key] = (expires, value)
+        self._entries.move_to_end(key)
+        if self.max_size is not None:
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def __delitem__(self, key: str) -> None:
+        del self._entries[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter([key for key in list(self._entries.keys()) if key in self])
+
+    def __len__(self) -> int:
+        return len(list(iter(self)))
+
+    def __repr__(self) -> str:
+        return repr({k: v for k, (_, v) in self._entries.items()})
+
+
+class CachingResolver:
+    """
+    A registered resolver.
+    Calls the resolver function with the arguments of an interpolation and caches the
+    results according to the cache policy given to OmegaConf.register_resolver().
+    The resolver function may be a coroutine function, see acall().
+    """
+
+    def __init__(
+        self,
+        name: str,
+        resolver: Callable[..., Any],
+        use_cache: bool = True,
+        cache_size: Optional[int] = None,
+        cache_ttl: Optional[float] = None,
+        pure: bool = False,
+    ) -> None:
+        self.name = name
+        self.resolver = resolver
+        self.use_cache = use_cache
+        self.cache_size = cache_size
+        self.cache_ttl = cache_ttl
+        # results of pure resolvers are shared by all configs
+        self.shared_cache: Optional[ResolverCache] = (
+            ResolverCache(max_size=cache_size, ttl=cache_ttl) if pure else None
+        )
+        self._lock = threading.Lock()
+
+    def is_async(self) -> bool:
+        return inspect.iscoroutinefunction(self.resolver)
+
+    def __call__(self, config: Any, key: str) -> Any:
+        store = self._get_store(config)
+        if store is not None:
+            found, val = self._lookup(store, key)
+            if found:
+                return val
+        recorder = _instrumentation.recorder
+        start = time.perf_counter() if recorder is not None else 0.0
+        val = self._invoke(key)
+        if inspect.isawaitable(val):
+            val = self._run_awaitable(val)
+        if recorder is not None:
+            recorder.record_call(self.name, time.perf_counter() - start)
+        return val if store is None else self._store(store, key, val)
+
+    async def acall(self, config: Any, key: str) -> Any:
+        """
+        Same as calling the resolver, but awaits coroutine resolvers on the running
+        event loop.
+        """
+        store = self._get_store(config)
+        if store is not None:
+            found, val = self._lookup(store, key)
+            if found:
+                return val
+        recorder = _instrumentation.recorder
+        start = time.perf_counter() if recorder is not None else 0.0
+        val = self._invoke(key)
+        if inspect.isawaitable(val):
+            val = await val
+        if recorder is not None:
+            recorder.record_call(self.name, time.perf_counter() - start)
+        return val if store is None else self._store(store, key, val)
+
+    def _invoke(self, key: str) -> Any:
+        from .omegaconf import OmegaConf
+
+        return self.resolver(*OmegaConf._tokenize_args(key))
+
+    def _run_awaitable(self, awaitable: Awaitable[Any]) -> Any:
+        # asyncio.get_running_loop() requires Python 3.7
+        if asyncio._get_running_loop() is not None:
+            if isinstance(awaitable, Coroutine):
+                awaitable.close()
+            raise RuntimeError(
+                "Async resolver '{}' cannot be resolved synchronously while an event loop"
+                " is running, use OmegaConf.aresolve()".format(self.name)
+            )
+        loop = asyncio.new_event_loop()
+        try:
+            return loop.run_until_complete(awaitable)
+        finally:
+            loop.close()
+
+    def _get_store(self, config: Any) -> Optional[ResolverCache]:
+        if not self.use_cache:
+            return None
+        if self.shared_cache is not None:
+            return self.shared_cache
+
+        from .omegaconf import OmegaConf
+
+        cache = OmegaConf.get_cache(config)
+        with self._lock:
+            store = cache.get(self.name)
+            if not isinstance(store, ResolverCache):
+                store = ResolverCache(
+                    max_size=self.cache_size, ttl=self.cache_ttl, content=store
+                )
+                cache[self.name] = store
+        return store
+
+    def _lookup(self, store: ResolverCache, key: str) -> Tuple[bool, Any]:
+        with self._lock:
+            found, val = store.lookup(key)
+        recorder = _instrumentation.recorder
+        if recorder is not None:
+            recorder.record_lookup(self.name, found)
+        return found, val
+
+    def _store(self, store: ResolverCache, key: str, val: Any) -> Any:
+        with self._lock:
+            # keep the first result if another thread resolved the key meanwhile
+            if key in store:
+                return store[key]
+            store[key] = val
+            return val
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> "CachingResolver":
+        # like a function, a registered resolver is not copied
+        return self
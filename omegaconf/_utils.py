@@ -1,9 +1,10 @@
 import re
 from enum import Enum
-from typing import Any, Dict, List, Match, Optional, Tuple, Type, Union
+from typing import Any, Dict, Tuple, Type
 
 import yaml
 
+from ._interpolation import parse_interpolation
 from .errors import KeyValidationError, ValidationError
 
 try:
@@ -220,7 +221,7 @@ class ValueKind(Enum):
     STR_INTERPOLATION = 3
 
 
-def get_value_kind(value: Any, return_match_list: bool = False) -> Any:
+def get_value_kind(value: Any) -> ValueKind:
     """
     Determine the kind of a value
     Examples:
@@ -230,45 +231,35 @@ def get_value_kind(value: Any, return_match_list: bool = False) -> Any:
     STR_INTERPOLATION: "ftp://${host}/path"
 
     :param value: input string to classify
-    :param return_match_list: True to return the match list as well
     :return: ValueKind
     """
-
-    key_prefix = r"\${(\w+:)?"
-    legal_characters = r"([\w\.%_ \\,-]*?)}"
-    match_list: Optional[List[Match[str]]] = None
-
-    def ret(
-        value_kind: ValueKind,
-    ) -> Union[ValueKind, Tuple[ValueKind, Optional[List[Match[str]]]]]:
-        if return_match_list:
-            return value_kind, match_list
-        else:
-            return value_kind
-
     from .base import Container
+    from .nodes import ValueNode
+
+    if isinstance(value, ValueNode):
+        return value._kind
 
     if isinstance(value, Container):
         if value._is_interpolation():
-            return ret(ValueKind.MANDATORY_MISSING)
+            return ValueKind.MANDATORY_MISSING
         if value._is_missing():
-            return ret(ValueKind.MANDATORY_MISSING)
+            return ValueKind.MANDATORY_MISSING
     value = _get_value(value)
 
     if value == "???":
-        return ret(ValueKind.MANDATORY_MISSING)
+        return ValueKind.MANDATORY_MISSING
 
     if not isinstance(value, str):
-        return ret(ValueKind.VALUE)
+        return ValueKind.VALUE
 
-    match_list = list(re.finditer(key_prefix + legal_characters, value))
-    if len(match_list) == 0:
-        return ret(ValueKind.VALUE)
+    parsed = parse_interpolation(value)
+    if parsed is None:
+        return ValueKind.VALUE
 
-    if len(match_list) == 1 and value == match_list[0].group(0):
-        return ret(ValueKind.INTERPOLATION)
+    if parsed.is_single_ref():
+        return ValueKind.INTERPOLATION
     else:
-        return ret(ValueKind.STR_INTERPOLATION)
+        return ValueKind.STR_INTERPOLATION
 
 
 def decode_primitive(s: str) -> Any:
@@ -364,12 +355,7 @@ def _is_primitive_type(type_: Any) -> bool:
 
 def _is_interpolation(v: Any) -> bool:
     if isinstance(v, str):
-        ret = get_value_kind(v) in (
-            ValueKind.INTERPOLATION,
-            ValueKind.STR_INTERPOLATION,
-        )
-        assert isinstance(ret, bool)
-        return ret
+        return parse_interpolation(v) is not None
     return False
 
 
@@ -1,10 +1,12 @@
+import copy
 from abc import ABC, abstractmethod
-from collections import defaultdict
-from dataclasses import dataclass, field
+from dataclasses import dataclass
 from enum import Enum
 from typing import Any, Dict, Iterator, Optional, Type, Union
 
-from ._utils import ValueKind, _get_value, get_value_kind
+from . import _instrumentation
+from ._interpolation import parse_interpolation
+from ._utils import ValueKind, _get_value
 from .errors import MissingMandatoryValue, UnsupportedInterpolationType
 
 
@@ -19,47 +21,168 @@ class Metadata:
     #   unset : inherit from parent (None if no parent specifies)
     #   set to true: flag is true
     #   set to false: flag is false
-    flags: Dict[str, bool] = field(default_factory=dict)
+    # None until a flag is set, most nodes never have flags of their own.
+    flags: Optional[Dict[str, bool]] = None
+
+    def _clone(self) -> "Metadata":
+        """Deep copy of the metadata, sharing the immutable keys and types"""
+        res: Metadata = object.__new__(type(self))
+        res.__dict__.update(self.__dict__)
+        if self.flags is not None:
+            res.flags = dict(self.flags)
+        return res
 
 
 @dataclass
 class ContainerMetadata(Metadata):
     element_type: Type[Any] = None  # type:ignore
-    resolver_cache: Dict[str, Any] = field(default_factory=lambda: defaultdict(dict))
+    # Resolver results, only allocated on the root container when first used.
+    resolver_cache: Optional[Dict[str, Any]] = None
+
+    def _clone(self) -> "ContainerMetadata":
+        res = super()._clone()
+        assert isinstance(res, ContainerMetadata)
+        if self.resolver_cache is not None:
+            res.resolver_cache = copy.deepcopy(self.resolver_cache)
+        return res
+
+
+# Incremented whenever an interpolation is resolved with a resolver. Values resolved
+# while it is unchanged do not depend on a resolver and can be cached.
+_resolver_calls = 0
+
+
+def resolver_call_count() -> int:
+    return _resolver_calls
+
+
+class HierarchyCache:
+    """
+    Values a node derives from its ancestors: its effective flags and its root.
+    Valid as long as the hierarchy generation of the root is unchanged.
+    A cache is not part of the state of a node, it is not copied or pickled.
+    """
+
+    __slots__ = ("generation", "flags", "root")
+
+    def __init__(self, root: "Container") -> None:
+        self.generation = root.__dict__["_hierarchy_generation"]
+        self.flags: Dict[str, Optional[bool]] = {}
+        self.root = root
+
+    def is_valid(self) -> bool:
+        return bool(self.generation == self.root.__dict__["_hierarchy_generation"])
+
+    def __copy__(self) -> None:
+        return None
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> None:
+        return None
+
+    def __reduce__(self) -> Any:
+        return type(None), ()
 
 
 class Node(ABC):
+    # Value nodes store their state in slots, containers in their __dict__.
+    # object.__setattr__ is used to set the state of both without going through
+    # DictConfig.__setattr__.
+    __slots__ = ()
+
     _metadata: Metadata
 
-    parent: Optional["Container"]
+    # Kind of the value held by this node, updated when the value is set.
+    _kind: ValueKind
+
+    _parent: Optional["Container"]
+
+    _hierarchy_cache: Optional[HierarchyCache]
 
     def __init__(self, parent: Optional["Container"], metadata: Metadata):
-        self.__dict__["_metadata"] = metadata
-        self.__dict__["_parent"] = parent
+        object.__setattr__(self, "_metadata", metadata)
+        object.__setattr__(self, "_parent", parent)
+        object.__setattr__(self, "_hierarchy_cache", None)
 
     def _set_parent(self, parent: Optional["Container"]) -> None:
         assert parent is None or isinstance(parent, Container)
-        self.__dict__["_parent"] = parent
+        self._invalidate_hierarchy_caches()
+        object.__setattr__(self, "_parent", parent)
+
+    def _invalidate_hierarchy_caches(self) -> None:
+        """
+        Invalidates the values the nodes of the config this node belongs to cache
+        from their ancestors. Called before a flag or the parent of this node changes.
+        """
+        if not isinstance(self, Container):
+            # a value node has no descendants caching values derived from it
+            object.__setattr__(self, "_hierarchy_cache", None)
+            return
+        root: Node = self
+        parent = self._parent
+        while parent is not None:
+            root = parent
+            parent = root._parent
+        root.__dict__["_hierarchy_generation"] += 1
+
+    def _get_hierarchy_cache(self) -> HierarchyCache:
+        """
+        Only valid for a node with a parent.
+        """
+        cache = self._hierarchy_cache
+        if cache is None or not cache.is_valid():
+            parent = self._get_parent()
+            assert parent is not None
+            cache = HierarchyCache(parent._get_root())
+            object.__setattr__(self, "_hierarchy_cache", cache)
+        return cache
 
     def _get_parent(self) -> Optional["Container"]:
-        parent = self.__dict__["_parent"]
+        parent = self._parent
         assert parent is None or isinstance(parent, Container)
         return parent
 
+    def _bump_generation(self, structure: bool = True) -> None:
+        """
+        Marks the config this node belongs to as modified, invalidating the values
+        cached by its root. Called before the value or the structure of a node changes.
+        :param structure: False if only the value of a value node changes, nodes stay
+                          at the same keys
+        """
+        parent = self._get_parent()
+        if parent is not None:
+            root: Node = parent._get_root()
+        elif isinstance(self, Container):
+            root = self
+        else:
+            return
+        root.__dict__["_generation"] += 1
+        if structure:
+            root.__dict__["_structure_generation"] += 1
+        pending = root.__dict__["_pending_copies"]
+        if pending is not None and len(pending) > 0:
+            # copies sharing the nodes modified get their own nodes first
+            pending.complete_path(self)
+
     def _set_flag(self, flag: str, value: Optional[bool]) -> None:
         assert value is None or isinstance(value, bool)
+        self._bump_generation(structure=False)
+        flags = self._metadata.flags
         if value is None:
-            if flag in self._metadata.flags:
-                del self._metadata.flags[flag]
+            if flags is not None and flag in flags:
+                del flags[flag]
         else:
-            self._metadata.flags[flag] = value
+            if flags is None:
+                flags = self._metadata.flags = {}
+            flags[flag] = value
+        self._invalidate_hierarchy_caches()
 
     def _get_node_flag(self, flag: str) -> Optional[bool]:
         """
         :param flag: flag to inspect
         :return: the state of the flag on this node.
         """
-        return self._metadata.flags[flag] if flag in self._metadata.flags else None
+        flags = self._metadata.flags
+        return flags[flag] if flags is not None and flag in flags else None
 
     def _get_flag(self, flag: str) -> Optional[bool]:
         """
@@ -69,58 +192,46 @@ class Node(ABC):
         :return:
         """
         flags = self._metadata.flags
-        if flag in flags and flags[flag] is not None:
+        if flags is not None and flag in flags and flags[flag] is not None:
             return flags[flag]
 
         parent = self._get_parent()
         if parent is None:
             return None
-        else:
-            # noinspection PyProtectedMember
-            return parent._get_flag(flag)
 
-    # TODO: simplify now that each node has it's own key
+        cache = self._get_hierarchy_cache()
+        if flag in cache.flags:
+            return cache.flags[flag]
+        # noinspection PyProtectedMember
+        value = parent._get_flag(flag)
+        cache.flags[flag] = value
+        return value
+
     def _get_full_key(self, key: Union[str, Enum, int]) -> str:
-        from .dictconfig import DictConfig
         from .listconfig import ListConfig
 
-        full_key = ""
-        child = None
-        cur: Optional[Node] = self
-        while cur is not None:
-            if isinstance(cur, DictConfig):
-                if child is None:
-                    full_key = "{}".format(key)
-                else:
-                    # find which the key for child in the parent
-                    for parent_key in cur.keys():
-                        if id(cur.get_node(parent_key)) == id(child):
-                            if isinstance(child, ListConfig):
-                                full_key = "{}{}".format(parent_key, full_key)
-                            else:
-                                if full_key == "":
-                                    full_key = parent_key
-                                else:
-                                    full_key = "{}.{}".format(parent_key, full_key)
-                            break
-            elif isinstance(cur, ListConfig):
-                if child is None:
-                    if key == "":
-                        full_key = f"{key}"
+        # the key of each node in its parent is stored in its metadata,
+        # the path is built from the keys of the ancestors of this node.
+        if isinstance(self, ListConfig):
+            full_key = "" if key == "" else "[{}]".format(key)
+        else:
+            full_key = "{}".format(key)
+        child: Node = self
+        parent = self._get_parent()
+        while parent is not None:
+            parent_key = child._key()
+            if parent_key is not None:
+                if isinstance(parent, ListConfig):
+                    if isinstance(child, ListConfig) or full_key == "":
+                        full_key = "[{}]{}".format(parent_key, full_key)
                     else:
-                        full_key = f"[{key}]"
+                        full_key = "[{}].{}".format(parent_key, full_key)
+                elif isinstance(child, ListConfig) or full_key == "":
+                    full_key = "{}{}".format(parent_key, full_key)
                 else:
-                    for idx, v in enumerate(cur):
-                        if id(v) == id(child):
-                            if isinstance(child, ListConfig):
-                                full_key = "[{}]{}".format(idx, full_key)
-                            else:
-                                full_key = "[{}].{}".format(idx, full_key)
-                            break
-            child = cur
+                    full_key = "{}.{}".format(parent_key, full_key)
+            child = parent
             parent = child._get_parent()
-            assert parent is None or isinstance(parent, Container)
-            cur = parent
 
         return full_key
 
@@ -128,21 +239,29 @@ class Node(ABC):
         from .nodes import StringNode
 
         if self._is_interpolation():
-            value_kind, match_list = get_value_kind(
-                value=self._value(), return_match_list=True
-            )
-            match = match_list[0]
+            value_kind = self._kind
             parent = self._get_parent()
             assert parent is not None
             key = self._key()
             if value_kind == ValueKind.INTERPOLATION:
+                parsed = parse_interpolation(self._value())
+                assert parsed is not None
+                ref = parsed.refs[0]
                 v = parent._resolve_interpolation(
                     key=key,
-                    inter_type=match.group(1),
-                    inter_key=match.group(2),
+                    inter_type=ref.inter_type,
+                    inter_key=ref.inter_key,
                     throw_on_missing=throw_on_missing,
                 )
-                return v
+                if isinstance(v, Node):
+                    return v
+                # a reference to a string interpolation resolves to a str
+                return StringNode(
+                    value=v,
+                    key=key,
+                    parent=parent,
+                    is_optional=self._metadata.optional,
+                )
             elif value_kind == ValueKind.STR_INTERPOLATION:
                 ret = parent._resolve_str_interpolation(
                     key=key, value=self, throw_on_missing=throw_on_missing
@@ -248,87 +367,106 @@ class Container(Node):
         ...  # pragma: no cover
 
     def _get_root(self) -> "Container":
-        root: Optional[Container] = self._get_parent()
-        if root is None:
+        parent = self._get_parent()
+        if parent is None:
             return self
-        assert root is not None and isinstance(root, Container)
-        while root._get_parent() is not None:
-            root = root._get_parent()
-            assert root is not None and isinstance(root, Container)
-        return root
+        return self._get_hierarchy_cache().root
 
     def _resolve_interpolation(
-        self, key: Any, inter_type: str, inter_key: str, throw_on_missing: bool,
-    ) -> "Node":
+        self,
+        key: Any,
+        inter_type: Optional[str],
+        inter_key: str,
+        throw_on_missing: bool,
+    ) -> Any:
+        """
+        Resolves a single interpolation reference.
+        :return: the referenced node, or a str if the referenced node is itself a string
+        interpolation.
+        """
         from omegaconf import OmegaConf
 
+        global _resolver_calls
+        recorder = _instrumentation.recorder
+        if recorder is not None:
+            recorder.enter_interpolation()
+        try:
+            root_node = self._get_root()
+
+            inter_type = "str" if inter_type is None else inter_type
+            if inter_type == "str":
+                parent, last_key, value = root_node._select_impl(inter_key)  # type: ignore
+                if parent is None or (value is None and last_key not in parent):
+                    raise KeyError(
+                        "{} interpolation key '{}' not found".format(
+                            inter_type, inter_key
+                        )
+                    )
+                if throw_on_missing and _is_missing_value(value):
+                    raise MissingMandatoryValue(parent._get_full_key(str(key)))
+                return value
+            else:
+                resolver = OmegaConf.get_resolver(inter_type)
+                if resolver is not None:
+                    _resolver_calls += 1
+                    return self._resolver_result_node(
+                        key, resolver(root_node, inter_key)
+                    )
+                else:
+                    raise UnsupportedInterpolationType(
+                        "Unsupported interpolation type {}".format(inter_type)
+                    )
+        finally:
+            if recorder is not None:
+                recorder.exit_interpolation()
+
+    def _resolver_result_node(self, key: Any, value: Any) -> Node:
+        """
+        Wraps the result of a resolver in a node for the interpolation at key.
+        """
         from .nodes import ValueNode
 
-        root_node = self._get_root()
-
-        inter_type = ("str:" if inter_type is None else inter_type)[0:-1]
-        if inter_type == "str":
-            parent, last_key, value = root_node._select_impl(inter_key)  # type: ignore
-            if parent is None or (value is None and last_key not in parent):
-                raise KeyError(
-                    "{} interpolation key '{}' not found".format(inter_type, inter_key)
-                )
-            if throw_on_missing and isinstance(value, Node) and value._is_missing():
-                raise MissingMandatoryValue(parent._get_full_key(str(key)))
-            assert isinstance(value, Node)
-            return value
-        else:
-            resolver = OmegaConf.get_resolver(inter_type)
-            if resolver is not None:
-                value = resolver(root_node, inter_key)
-                assert isinstance(self, Container)
-                node = self.get_node(key)
-                return ValueNode(
-                    value=value,
-                    parent=self,
-                    key=key,
-                    is_optional=node._metadata.optional,
-                )
-            else:
-                raise UnsupportedInterpolationType(
-                    "Unsupported interpolation type {}".format(inter_type)
-                )
+        node = self.get_node(key)
+        return ValueNode(
+            value=value, parent=self, key=key, is_optional=node._metadata.optional,
+        )
 
     def _resolve_str_interpolation(
-        self, key: Any, value: "Node", throw_on_missing: bool
+        self, key: Any, value: Any, throw_on_missing: bool
     ) -> Any:
-        from .nodes import StringNode
-
-        value_kind, match_list = get_value_kind(value=value, return_match_list=True)
-        if value_kind not in (ValueKind.INTERPOLATION, ValueKind.STR_INTERPOLATION):
+        """
+        Resolves value if it is an interpolation.
+        String interpolations are rendered to a str, other values are returned as is.
+        """
+        if isinstance(value, Container):
+            return value
+        raw = _get_value(value)
+        if not isinstance(raw, str):
+            return value
+        parsed = parse_interpolation(raw)
+        if parsed is None:
             return value
 
-        if value_kind == ValueKind.INTERPOLATION:
+        if parsed.is_single_ref():
             # simple interpolation, inherit type
-            match = match_list[0]
+            ref = parsed.refs[0]
             return self._resolve_interpolation(
                 key=key,
-                inter_type=match.group(1),
-                inter_key=match.group(2),
+                inter_type=ref.inter_type,
+                inter_key=ref.inter_key,
                 throw_on_missing=throw_on_missing,
             )
-        elif value_kind == ValueKind.STR_INTERPOLATION:
-            value = _get_value(value)
-            assert isinstance(value, str)
-            orig = value
-            new = ""
-            last_index = 0
-            for match in match_list:
-                new_val = self._resolve_interpolation(
-                    key=key,
-                    inter_type=match.group(1),
-                    inter_key=match.group(2),
-                    throw_on_missing=throw_on_missing,
-                )
-                new += orig[last_index : match.start(0)] + str(new_val)
-                last_index = match.end(0)
+        return parsed.render(
+            lambda ref: self._resolve_interpolation(
+                key=key,
+                inter_type=ref.inter_type,
+                inter_key=ref.inter_key,
+                throw_on_missing=throw_on_missing,
+            )
+        )
 
-            new += orig[last_index:]
-            return StringNode(value=new, key=key)
-        else:
-            assert False  # pragma: no cover
+
+def _is_missing_value(value: Any) -> bool:
+    if isinstance(value, Node):
+        return value._is_missing()
+    return bool(value == "???")
@@ -1,23 +1,316 @@
 import copy
 import sys
 import warnings
+import weakref
 from abc import ABC, abstractmethod
 from enum import Enum
-from typing import Any, Dict, List, Optional, Tuple, Union
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple, Union
 
 import yaml
 
+from ._pickling import pickle_config, unpickle_config
 from ._utils import (
     ValueKind,
     _get_value,
-    _is_interpolation,
     get_value_kind,
     get_yaml_loader,
     is_primitive_container,
     is_structured_config,
 )
-from .base import Container, ContainerMetadata, Node
+from .base import Container, ContainerMetadata, Node, resolver_call_count
 from .errors import MissingMandatoryValue, ReadonlyConfigError, ValidationError
+from .nodes import ValueNode
+
+if TYPE_CHECKING:
+    from ._resolution import BulkResolver  # noqa F401
+
+
+class PathIndex:
+    """
+    Index of the nodes selected by dotted key from a root container, enabled with
+    OmegaConf.set_path_index().
+    Entries map a key to (parent container, last key, node). They are added on first
+    select and dropped when nodes are added, removed or moved in the config.
+    An index is not part of the state of a config: copies start with an empty index.
+    """
+
+    __slots__ = ("generation", "entries")
+
+    def __init__(self) -> None:
+        self.generation = -1
+        self.entries: Dict[
+            str, Tuple[Optional[Container], Optional[str], Optional[Node]]
+        ] = {}
+
+    def get_entries(
+        self, generation: int
+    ) -> Dict[str, Tuple[Optional[Container], Optional[str], Optional[Node]]]:
+        """
+        :param generation: current structure generation of the root
+        :return: the entries, emptied first if the structure changed
+        """
+        if generation != self.generation:
+            self.entries = {}
+            self.generation = generation
+        return self.entries
+
+    def __copy__(self) -> "PathIndex":
+        return PathIndex()
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> "PathIndex":
+        return PathIndex()
+
+    def __reduce__(self) -> Any:
+        return PathIndex, ()
+
+
+class ResolvedCache:
+    """
+    Cache of resolved interpolation values of a root container, enabled with
+    OmegaConf.set_resolved_cache().
+    Entries map id(node) to (node, resolved value). They are dropped whenever the
+    config is modified.
+    A cache is not part of the state of a config: copies start with an empty cache.
+    """
+
+    __slots__ = ("generation", "entries")
+
+    def __init__(self) -> None:
+        self.generation = -1
+        self.entries: Dict[int, Tuple[Node, Any]] = {}
+
+    def get_entries(self, generation: int) -> Dict[int, Tuple[Node, Any]]:
+        """
+        :param generation: current generation of the root
+        :return: the entries, emptied first if the config was modified
+        """
+        if generation != self.generation:
+            self.entries = {}
+            self.generation = generation
+        return self.entries
+
+    def __copy__(self) -> "ResolvedCache":
+        return ResolvedCache()
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> "ResolvedCache":
+        return ResolvedCache()
+
+    def __reduce__(self) -> Any:
+        return ResolvedCache, ()
+
+
+class LazyContent:
+    """
+    Content of a container created with OmegaConf.create(obj, lazy=True): the
+    primitive dict or list it was created from, kept as is.
+    The nodes are created when the content is first used: the container then
+    replaces its LazyContent with the nodes, operations on the LazyContent are
+    forwarded to them.
+    The primitive data is never modified, copies of the container share it.
+    """
+
+    __slots__ = ("_container", "_raw")
+
+    def __init__(
+        self,
+        container: Optional["BaseContainer"],
+        raw: Union[Dict[Any, Any], List[Any], Tuple[Any, ...]],
+    ) -> None:
+        self._container = container
+        self._raw: Any = raw
+
+    def _create_nodes(self) -> Any:
+        assert self._container is not None
+        return self._container._create_nodes(self._raw)
+
+    def _nodes(self) -> Any:
+        assert self._container is not None
+        return self._container._materialize()
+
+    def __len__(self) -> int:
+        return len(self._nodes())
+
+    def __iter__(self) -> Any:
+        return iter(self._nodes())
+
+    def __contains__(self, key: Any) -> bool:
+        return key in self._nodes()
+
+    def __getitem__(self, key: Any) -> Any:
+        return self._nodes()[key]
+
+    def __setitem__(self, key: Any, value: Any) -> None:
+        self._nodes()[key] = value
+
+    def __delitem__(self, key: Any) -> None:
+        del self._nodes()[key]
+
+    def __repr__(self) -> str:
+        return repr(self._nodes())
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(self._nodes(), name)
+
+    # the copy is attached to its container by _re_parent()
+    def __copy__(self) -> "LazyContent":
+        return LazyContent(None, self._raw)
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> "LazyContent":
+        return LazyContent(None, self._raw)
+
+    def __reduce__(self) -> Any:
+        return LazyContent, (self._container, self._raw)
+
+
+class CopiedContent(LazyContent):
+    """
+    Content of a deep copy of a container which shares the nodes of the container it
+    was copied from: the nodes of the copy are copied from the source when the
+    content of the copy is first used, one level at a time.
+    The copy is registered with the root of the source, which completes its pending
+    copies before it is modified (see PendingCopies).
+    """
+
+    __slots__ = ("__weakref__",)
+
+    def __init__(
+        self, container: Optional["BaseContainer"], source: "BaseContainer"
+    ) -> None:
+        super().__init__(container, {})
+        self._raw = source
+        PendingCopies.register(source, self)
+
+    def _create_nodes(self) -> Any:
+        assert self._container is not None
+        return self._container._copy_nodes(self._raw)
+
+    def __copy__(self) -> "CopiedContent":
+        return CopiedContent(None, self._raw)
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> "CopiedContent":
+        return CopiedContent(None, self._raw)
+
+    def __reduce__(self) -> Any:
+        return CopiedContent, (self._container, self._raw)
+
+
+class OverlayContent(LazyContent):
+    """
+    Content of a config created by OmegaConf.overlay(): the content of the base config
+    and a config overriding some of its values.
+    The nodes are created by merging the override into the nodes of the base when the
+    content is first used, one level at a time: a dict overriding a dict becomes an
+    OverlayContent of its own.
+    """
+
+    __slots__ = ("_override",)
+
+    def __init__(
+        self,
+        container: Optional["BaseContainer"],
+        content: Any,
+        override: "BaseContainer",
+    ) -> None:
+        super().__init__(container, {})
+        self._raw = content
+        self._override = override
+
+    def _create_nodes(self) -> Any:
+        assert self._container is not None
+        return self._container._overlay_nodes(self._raw, self._override)
+
+    # merging consumes the override, copies are made from the merged nodes
+    def __copy__(self) -> Any:
+        return copy.copy(self._nodes())
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> Any:
+        return copy.deepcopy(self._nodes(), memo=memo)
+
+    def __reduce__(self) -> Any:
+        return OverlayContent, (self._container, self._raw, self._override)
+
+
+class PendingCopies:
+    """
+    The CopiedContents sharing nodes with a config, kept by its root and indexed by
+    the container they were copied from.
+    Modifying a node only completes the copies of the node and of its ancestors,
+    the copies of the rest of the config keep sharing its nodes.
+    A pending copy is not part of the state of a config: copies of the root start
+    with no pending copies.
+    """
+
+    __slots__ = ("contents",)
+
+    def __init__(self) -> None:
+        # id of the source container -> the copies of the source, by id
+        self.contents: Dict[int, Dict[int, "weakref.ReferenceType[CopiedContent]"]] = {}
+
+    @staticmethod
+    def register(source: "BaseContainer", content: CopiedContent) -> None:
+        root = source._get_root()
+        pending = root.__dict__["_pending_copies"]
+        if pending is None:
+            pending = root.__dict__["_pending_copies"] = PendingCopies()
+        source_id = id(source)
+        content_id = id(content)
+
+        def discard(ref: "weakref.ReferenceType[CopiedContent]") -> None:
+            copies = pending.contents.get(source_id)
+            if copies is not None and copies.get(content_id) is ref:
+                del copies[content_id]
+                if len(copies) == 0:
+                    del pending.contents[source_id]
+
+        copies = pending.contents.setdefault(source_id, {})
+        copies[content_id] = weakref.ref(content, discard)
+
+    def _complete_source(self, source_id: int) -> None:
+        copies = self.contents.pop(source_id, None)
+        if copies is None:
+            return
+        for ref in copies.values():
+            content = ref()
+            if content is not None and content._container is not None:
+                content._container._materialize()
+
+    def complete(self) -> None:
+        """
+        Creates the nodes of all the pending copies.
+        """
+        # creating the nodes of a copy registers copies of its child containers
+        while len(self.contents) > 0:
+            self._complete_source(next(iter(self.contents)))
+
+    def complete_path(self, node: Node) -> None:
+        """
+        Creates the nodes of the pending copies of node and of its ancestors, the
+        copies sharing the nodes that change when node is modified.
+        Called before node is modified.
+        """
+        path: List[Node] = []
+        current: Optional[Node] = node
+        while current is not None:
+            path.append(current)
+            current = current._get_parent()
+        # from the root: creating the nodes of a copy registers copies of its
+        # child containers, the next container on the path is one of them
+        for current in reversed(path):
+            self._complete_source(id(current))
+
+    def __len__(self) -> int:
+        return len(self.contents)
+
+    def __copy__(self) -> None:
+        return None
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> None:
+        return None
+
+    def __reduce__(self) -> Any:
+        return type(None), ()
 
 
 class BaseContainer(Container, ABC):
@@ -29,6 +322,21 @@ class BaseContainer(Container, ABC):
             parent=parent, metadata=metadata,
         )
         self.__dict__["_content"] = None
+        self.__dict__["_kind"] = ValueKind.VALUE
+        # Incremented on every modification of a config this container is the root of.
+        self.__dict__["_generation"] = 0
+        # Incremented when nodes are added, removed or moved in a config this
+        # container is the root of.
+        self.__dict__["_structure_generation"] = 0
+        # Incremented when a flag or a parent changes in a config this container is
+        # the root of, which invalidates the HierarchyCache of its nodes.
+        self.__dict__["_hierarchy_generation"] = 0
+        # None unless enabled with OmegaConf.set_resolved_cache().
+        self.__dict__["_resolved_cache"] = None
+        # None unless enabled with OmegaConf.set_path_index().
+        self.__dict__["_path_index"] = None
+        # Copies sharing nodes with the config this container is the root of.
+        self.__dict__["_pending_copies"] = None
 
     def save(self, f: str) -> None:
         warnings.warn(
@@ -46,8 +354,41 @@ class BaseContainer(Container, ABC):
     ) -> Any:
         """returns the value with the specified key, like obj.key and obj['key']"""
 
+        if isinstance(value, Node) and value._kind is ValueKind.VALUE:
+            # plain values need no classification or resolution
+            if isinstance(value, ValueNode):
+                plain = value._value()
+            else:
+                plain = None if value._is_none() else value
+            if plain is not None or default_value is None:
+                return plain
+
+        if (
+            default_value is None
+            and isinstance(value, ValueNode)
+            and value._is_interpolation()
+        ):
+            root = self._get_root()
+            cache: Optional[ResolvedCache] = root.__dict__["_resolved_cache"]
+            if cache is not None:
+                entries = cache.get_entries(root.__dict__["_generation"])
+                entry = entries.get(id(value))
+                if entry is not None and entry[0] is value:
+                    return entry[1]
+                resolver_calls = resolver_call_count()
+                resolved = self._resolve_value(key, value, default_value)
+                # resolver results are cached according to the policy of each resolver
+                if resolver_call_count() == resolver_calls:
+                    entries[id(value)] = (value, resolved)
+                return resolved
+
+        return self._resolve_value(key, value, default_value)
+
+    def _resolve_value(
+        self, key: Union[str, int, Enum], value: Any, default_value: Any
+    ) -> Any:
         def is_mandatory_missing(val: Any) -> bool:
-            return get_value_kind(val) == ValueKind.MANDATORY_MISSING  # type: ignore
+            return get_value_kind(val) == ValueKind.MANDATORY_MISSING
 
         value = _get_value(value)
 
@@ -76,17 +417,22 @@ class BaseContainer(Container, ABC):
         else:
             return self.__dict__["_content"].__repr__()  # type: ignore
 
-    # Support pickle
-    def __getstate__(self) -> Dict[str, Any]:
-        return self.__dict__
-
-    # Support pickle
-    def __setstate__(self, d: Dict[str, Any]) -> None:
-        self.__dict__.update(d)
+    # Support pickle, see _pickling
+    def __reduce__(self) -> Any:
+        content, types = pickle_config(self)
+        caches = (
+            self.__dict__["_resolved_cache"] is not None,
+            self.__dict__["_path_index"] is not None,
+        )
+        return (
+            unpickle_config,
+            (content, types, self._key(), self.__dict__["_parent"], caches),
+        )
 
     def __delitem__(self, key: Union[str, int, slice]) -> None:
         if self._get_flag("readonly"):
             raise ReadonlyConfigError(self._get_full_key(str(key)))
+        self._bump_generation()
         del self.__dict__["_content"][key]
 
     def __len__(self) -> int:
@@ -126,6 +472,13 @@ class BaseContainer(Container, ABC):
         """Updates a dot separated key sequence to a value"""
         split = key.split(".")
         root = self
+        entries = self._get_path_index_entries()
+        if len(split) > 1 and entries is not None:
+            # start from the parent container if it is indexed
+            entry = entries.get(".".join(split[0:-1]))
+            if entry is not None and isinstance(entry[2], BaseContainer):
+                root = entry[2]
+                split = split[-1:]
         for i in range(len(split) - 1):
             k = split[i]
             # if next_root is a primitive (string, int etc) replace it with an empty map
@@ -150,19 +503,56 @@ class BaseContainer(Container, ABC):
         _root, _last_key, value = self._select_impl(key)
         return _get_value(value)
 
-    def _select_impl(
-        self, key: str
-    ) -> Tuple[Optional[Container], Optional[str], Optional[Node]]:
+    def _select_impl(self, key: str) -> Tuple[Optional[Container], Optional[str], Any]:
         """
         Select a value using dot separated key sequence
         :param key:
         :return:
         """
-        from .omegaconf import _select_one
-
         if key == "":
             return self, "", self
 
+        root, last_key, value = self._select_node(key)
+        if value is None:
+            return root, last_key, value
+        value = self._resolve_str_interpolation(
+            key=last_key, value=value, throw_on_missing=False
+        )
+        return root, last_key, value
+
+    def _select_node(
+        self, key: str
+    ) -> Tuple[Optional[Container], Optional[str], Optional[Node]]:
+        """
+        Select a node using dot separated key sequence, without resolving it.
+        Uses the path index if enabled on this container.
+        :return: (parent container, last key, node), the node is None if not found
+        """
+        entries = self._get_path_index_entries()
+        if entries is None:
+            return self._walk_path(key)
+        entry = entries.get(key)
+        if entry is None:
+            entry = entries[key] = self._walk_path(key)
+        return entry
+
+    def _get_path_index_entries(
+        self,
+    ) -> Optional[Dict[str, Tuple[Optional[Container], Optional[str], Optional[Node]]]]:
+        """
+        :return: the entries of the path index, None if it is not enabled or if this
+        container is not a root
+        """
+        path_index: Optional[PathIndex] = self.__dict__["_path_index"]
+        if path_index is None or self._get_parent() is not None:
+            return None
+        return path_index.get_entries(self.__dict__["_structure_generation"])
+
+    def _walk_path(
+        self, key: str
+    ) -> Tuple[Optional[Container], Optional[str], Optional[Node]]:
+        from .omegaconf import _select_one
+
         split = key.split(".")
         root: Optional[Container] = self
         for i in range(len(split) - 1):
@@ -178,11 +568,6 @@ class BaseContainer(Container, ABC):
 
         last_key = split[-1]
         value, _ = _select_one(root, last_key)
-        if value is None:
-            return root, last_key, value
-        value = self._resolve_str_interpolation(
-            key=last_key, value=value, throw_on_missing=False
-        )
         return root, last_key, value
 
     def is_empty(self) -> bool:
@@ -191,7 +576,35 @@ class BaseContainer(Container, ABC):
 
     @staticmethod
     def _to_content(
-        conf: Container, resolve: bool, enum_to_str: bool = False
+        conf: Container,
+        resolve: bool,
+        enum_to_str: bool = False,
+        resolver: Optional["BulkResolver"] = None,
+    ) -> Union[Dict[str, Any], List[Any]]:
+        from ._resolution import BulkResolver
+
+        assert isinstance(conf, Container)
+        if resolve and resolver is None:
+            # shared by the whole conversion, each interpolation is resolved once
+            resolver = BulkResolver()
+        if resolver is None:
+            return BaseContainer._convert_content(
+                conf, resolve=resolve, enum_to_str=enum_to_str, resolver=None
+            )
+        resolver.enter_container(conf)
+        try:
+            return BaseContainer._convert_content(
+                conf, resolve=resolve, enum_to_str=enum_to_str, resolver=resolver
+            )
+        finally:
+            resolver.exit_container(conf)
+
+    @staticmethod
+    def _convert_content(
+        conf: Container,
+        resolve: bool,
+        enum_to_str: bool,
+        resolver: Optional["BulkResolver"],
     ) -> Union[Dict[str, Any], List[Any]]:
         from .dictconfig import DictConfig
         from .listconfig import ListConfig
@@ -203,13 +616,18 @@ class BaseContainer(Container, ABC):
 
             return val
 
-        assert isinstance(conf, Container)
         if isinstance(conf, DictConfig):
             retdict: Dict[str, Any] = {}
-            for key, value in conf.items_ex(resolve=resolve):
+            for key, value in conf.items_ex(resolve=False):
+                if resolver is not None:
+                    node = conf.__dict__["_content"][key]
+                    value = resolver.resolve_value(conf, key, node)
                 if isinstance(value, Container):
                     retdict[key] = BaseContainer._to_content(
-                        value, resolve=resolve, enum_to_str=enum_to_str
+                        value,
+                        resolve=resolve,
+                        enum_to_str=enum_to_str,
+                        resolver=resolver,
                     )
                 else:
                     retdict[key] = convert(value)
@@ -217,12 +635,16 @@ class BaseContainer(Container, ABC):
         elif isinstance(conf, ListConfig):
             retlist: List[Any] = []
             for index, item in enumerate(conf):
-                if resolve:
-                    item = conf[index]
+                if resolver is not None:
+                    node = conf.get_node(index)
+                    item = resolver.resolve_value(conf, index, node)
                 item = convert(item)
                 if isinstance(item, Container):
                     item = BaseContainer._to_content(
-                        item, resolve=resolve, enum_to_str=enum_to_str
+                        item,
+                        resolve=resolve,
+                        enum_to_str=enum_to_str,
+                        resolver=resolver,
                     )
                 retlist.append(item)
             return retlist
@@ -255,92 +677,285 @@ class BaseContainer(Container, ABC):
 
     @staticmethod
     def _map_merge(dest: "BaseContainer", src: "BaseContainer") -> None:
-        """merge src into dest and return a new copy, does not modified input"""
+        """merge src into dest, src is not modified"""
+        BaseContainer._map_merge_all(dest, [src])
+
+    @staticmethod
+    def _map_merge_all(dest: "BaseContainer", srcs: List["BaseContainer"]) -> None:
+        """
+        merge srcs into dest in a single pass, walking all of them key by key.
+        The result is the same as merging them one at a time, but a value overridden
+        by a later source is not merged into dest.
+        srcs are not modified, their nodes are copied when they are added to dest
+        """
+        from .dictconfig import DictConfig
+
+        def object_type(node: BaseContainer) -> Any:
+            assert isinstance(node, DictConfig)
+            return node._metadata.object_type
+
+        assert isinstance(dest, DictConfig)
+        start = 0
+        while start < len(srcs):
+            src_type = object_type(srcs[start])
+            if src_type is not None and src_type is not object_type(dest):
+                BaseContainer._set_object_type(dest, src_type)
+            # a source changing the structured type of dest resets its content:
+            # it starts a new pass
+            end = start + 1
+            while end < len(srcs) and object_type(srcs[end]) in (
+                None,
+                object_type(dest),
+            ):
+                end += 1
+
+            key_srcs: Dict[Any, List[BaseContainer]] = {}
+            for src in srcs[start:end]:
+                assert isinstance(src, DictConfig)
+                for key in src.keys():
+                    key_srcs.setdefault(key, []).append(src)
+            for key, values_srcs in key_srcs.items():
+                BaseContainer._merge_items(dest, values_srcs, key)
+            start = end
+
+    @staticmethod
+    def _set_object_type(dest: "BaseContainer", object_type: Any) -> None:
+        """replace the content of dest with the defaults of the structured type"""
+        from .dictconfig import DictConfig
+
+        prototype = DictConfig(annotated_type=object_type, content=object_type,)
+
+        # copies sharing the content of dest get their own nodes first
+        dest._bump_generation()
+        dest.__dict__["_content"] = copy.deepcopy(prototype.__dict__["_content"])
+        dest.__dict__["_kind"] = ValueKind.VALUE
+        dest_key = dest._key()
+        dest.__dict__["_metadata"] = copy.deepcopy(prototype._metadata)
+        dest._set_key(dest_key)
+        for node in dest.__dict__["_content"].values():
+            node._set_parent(dest)
+        dest._invalidate_hierarchy_caches()
+
+    @staticmethod
+    def _merge_items(
+        dest: "BaseContainer", srcs: List["BaseContainer"], key: Any
+    ) -> None:
+        """
+        merge the values of key in srcs into dest, in order.
+        Of consecutive values replacing each other only the last is merged:
+        values set to a value node and lists merged into a list.
+        Consecutive dicts merged into a dict are merged in a single pass.
+        """
+        from .dictconfig import DictConfig
+        from .listconfig import ListConfig
+
+        def is_plain(node: Any) -> bool:
+            return (
+                not node._is_none()
+                and not node._is_missing()
+                and not node._is_interpolation()
+            )
+
+        def value_of(node: Node) -> Any:
+            return node._value() if isinstance(node, ValueNode) else node
+
+        i = 0
+        while i < len(srcs):
+            dest_node = dest.get_node(key)
+            value = srcs[i].get_node(key)
+            j = i + 1
+            if isinstance(dest_node, ValueNode) and isinstance(value, ValueNode):
+                while j < len(srcs) and isinstance(srcs[j].get_node(key), ValueNode):
+                    j += 1
+                last = srcs[j - 1].get_node(key)
+                assert last is not None
+                BaseContainer._merge_item(dest, srcs[j - 1], key, value_of(last))
+            elif (
+                isinstance(dest_node, DictConfig)
+                and is_plain(dest_node)
+                and isinstance(value, DictConfig)
+            ):
+                dest_type = dest_node._metadata.object_type
+
+                def is_mergeable(node: Any) -> bool:
+                    return (
+                        isinstance(node, DictConfig)
+                        and is_plain(node)
+                        and node._metadata.object_type in (None, dest_type)
+                    )
+
+                if is_mergeable(value):
+                    while j < len(srcs) and is_mergeable(srcs[j].get_node(key)):
+                        j += 1
+                    values: List[BaseContainer] = []
+                    for src in srcs[i:j]:
+                        node = src.get_node(key)
+                        assert isinstance(node, DictConfig)
+                        dest._validate_set(key=key, value=node)
+                        values.append(node)
+                    BaseContainer._map_merge_all(dest_node, values)
+                else:
+                    BaseContainer._merge_item(dest, srcs[i], key, value)
+            elif (
+                isinstance(dest_node, ListConfig)
+                and is_plain(dest_node)
+                and isinstance(value, ListConfig)
+                and is_plain(value)
+            ):
+                while j < len(srcs):
+                    node = srcs[j].get_node(key)
+                    if not isinstance(node, ListConfig) or not is_plain(node):
+                        break
+                    j += 1
+                for src in srcs[i : j - 1]:
+                    dest._validate_set(key=key, value=src.get_node(key))
+                BaseContainer._merge_item(
+                    dest, srcs[j - 1], key, srcs[j - 1].get_node(key)
+                )
+            else:
+                assert value is not None
+                BaseContainer._merge_item(dest, srcs[i], key, value_of(value))
+            i = j
+
+    @staticmethod
+    def _merge_item(
+        dest: "BaseContainer", src: "BaseContainer", key: Any, value: Any
+    ) -> None:
+        """merge the value of key in src into dest"""
         from omegaconf import OmegaConf
 
         from .dictconfig import DictConfig
-        from .nodes import ValueNode
 
         assert isinstance(dest, DictConfig)
-        assert isinstance(src, DictConfig)
-        src = copy.deepcopy(src)
-        src_type = src._metadata.object_type
-        dest_type = dest._metadata.object_type
-
-        if src_type is not None and src_type is not dest_type:
-            prototype = DictConfig(annotated_type=src_type, content=src_type,)
-
-            dest.__dict__["_content"] = copy.deepcopy(prototype.__dict__["_content"])
-            dest.__dict__["_metadata"] = copy.deepcopy(prototype._metadata)
-
-        for key, value in src.items_ex(resolve=False):
-
-            dest_element_type = dest._metadata.element_type
-            typed = dest_element_type not in (None, Any)
-            if OmegaConf.is_missing(dest, key):
-                if isinstance(value, DictConfig):
-                    if OmegaConf.is_missing(src, key):
-                        dest[key] = DictConfig(content="???")
-                    else:
-                        dest[key] = {}
-            if (dest.get_node(key) is not None) or typed:
+        dest_element_type = dest._metadata.element_type
+        typed = dest_element_type not in (None, Any)
+        if OmegaConf.is_missing(dest, key):
+            if isinstance(value, DictConfig):
+                if OmegaConf.is_missing(src, key):
+                    dest[key] = DictConfig(content="???")
+                else:
+                    dest[key] = {}
+        if (dest.get_node(key) is not None) or typed:
+            dest_node = dest.get_node(key)
+            if dest_node is None and typed:
+                dest[key] = DictConfig(content=dest_element_type, parent=dest)
                 dest_node = dest.get_node(key)
-                if dest_node is None and typed:
-                    dest[key] = DictConfig(content=dest_element_type, parent=dest)
-                    dest_node = dest.get_node(key)
-
-                if isinstance(dest_node, BaseContainer):
-                    if isinstance(value, BaseContainer):
-                        dest._validate_set(key=key, value=value)
-                        dest_node.merge_with(value)
-                    else:
-                        dest.__setitem__(key, value)
+
+            if isinstance(dest_node, BaseContainer):
+                if isinstance(value, BaseContainer):
+                    dest._validate_set(key=key, value=value)
+                    dest_node._merge_impl(value)
+                else:
+                    dest.__setitem__(key, value)
+            else:
+                if isinstance(value, BaseContainer):
+                    dest.__setitem__(key, dest._copy_child(value))
                 else:
-                    if isinstance(value, BaseContainer):
-                        dest.__setitem__(key, value)
-                    else:
-                        assert isinstance(dest_node, ValueNode)
-                        dest_node._set_value(value)
+                    assert isinstance(dest_node, ValueNode)
+                    dest_node._set_value(value)
+        else:
+            node = src.get_node(key)
+            assert node is not None
+            dest[key] = dest._copy_child(node)
+
+    def _overlay_nodes(self, content: Any, override: "BaseContainer") -> Any:
+        """
+        Creates the nodes of an overlay: the nodes of the base content, with override
+        merged into them. A dict overriding a dict is merged when it is first used.
+        :param content: content of the base, nodes or a LazyContent
+        :param override: a config private to the overlay
+        """
+        from .dictconfig import DictConfig
+
+        assert isinstance(self, DictConfig)
+        assert isinstance(override, DictConfig)
+
+        def is_plain_dict(node: Any) -> bool:
+            return (
+                isinstance(node, DictConfig)
+                and not node._is_none()
+                and not node._is_missing()
+                and not node._is_interpolation()
+            )
+
+        if isinstance(content, LazyContent):
+            content._container = self
+            content = content._create_nodes()
+        self.__dict__["_content"] = content
+        src_type = override._metadata.object_type
+        if src_type is not None and src_type is not self._metadata.object_type:
+            BaseContainer._map_merge(self, override)
+            return self.__dict__["_content"]
+        for key, value in override.items_ex(resolve=False):
+            dest_node = self.get_node(key)
+            src_node = override.get_node(key)
+            if (
+                is_plain_dict(dest_node)
+                and isinstance(src_node, DictConfig)
+                and is_plain_dict(src_node)
+                and src_node._metadata.object_type is None
+            ):
+                assert isinstance(dest_node, DictConfig)
+                dest_node.__dict__["_content"] = OverlayContent(
+                    dest_node, dest_node.__dict__["_content"], src_node
+                )
             else:
-                dest[key] = src.get_node(key)
+                BaseContainer._merge_item(self, override, key, value)
+        return self.__dict__["_content"]
 
     def merge_with(
         self,
         *others: Union["BaseContainer", Dict[str, Any], List[Any], Tuple[Any], Any],
     ) -> None:
         from .dictconfig import DictConfig
-        from .listconfig import ListConfig
         from .omegaconf import OmegaConf
 
         """merge a list of other Config objects into this one, overriding as needed"""
+        self._bump_generation()
+        copies: List[Any] = []
         for other in others:
             if is_primitive_container(other) or is_structured_config(other):
                 other = OmegaConf.create(other)
+            elif (
+                isinstance(other, BaseContainer)
+                and other._get_root() is self._get_root()
+            ):
+                # merging a config into itself, other must not change during the merge
+                other = copy.deepcopy(other)
 
             if other is None:
                 raise ValueError("Cannot merge with a None config")
-            if isinstance(self, DictConfig) and isinstance(other, DictConfig):
-                BaseContainer._map_merge(self, other)
-            elif isinstance(self, ListConfig) and isinstance(other, ListConfig):
-                if self._get_flag("readonly"):
-                    raise ReadonlyConfigError(self._get_full_key(""))
-                self.__dict__["_content"].clear()
-                for item in other:
-                    self.append(item)
-            else:
-                raise TypeError("Merging DictConfig with ListConfig is not supported")
+            copies.append(other)
 
-        # recursively correct the parent hierarchy after the merge
-        self._re_parent()
+        if isinstance(self, DictConfig) and all(
+            isinstance(other, DictConfig) for other in copies
+        ):
+            BaseContainer._map_merge_all(self, copies)
+        else:
+            for other in copies:
+                self._merge_impl(other)
 
-    # noinspection PyProtectedMember
-    def _set_item_impl(self, key: Any, value: Any) -> None:
-        from omegaconf.omegaconf import OmegaConf, _maybe_wrap
+    def _merge_impl(self, other: Any) -> None:
+        """merge other into this config, other is not modified"""
+        from .dictconfig import DictConfig
+        from .listconfig import ListConfig
 
-        from .nodes import ValueNode
+        if isinstance(self, DictConfig) and isinstance(other, DictConfig):
+            BaseContainer._map_merge(self, other)
+        elif isinstance(self, ListConfig) and isinstance(other, ListConfig):
+            if self._get_flag("readonly"):
+                raise ReadonlyConfigError(self._get_full_key(""))
+            # the content is replaced rather than cleared: a lazy content is not
+            # materialized
+            self._set_value(other)
+        else:
+            raise TypeError("Merging DictConfig with ListConfig is not supported")
 
+    # noinspection PyProtectedMember
+    def _set_item_impl(self, key: Any, value: Any) -> None:
         self._validate_get(key)
         self._validate_set(key, value)
+        self._bump_generation(structure=False)
 
         must_wrap = is_primitive_container(value)
         input_config = isinstance(value, Container)
@@ -361,23 +976,16 @@ class BaseContainer(Container, ABC):
         elif isinstance(self.__dict__["_content"], list):
             target_node = isinstance(target_node_ref, ValueNode)
 
-        def wrap(key: Any, val: Any) -> Node:
-            if is_structured_config(val):
-                type_ = OmegaConf.get_type(val)
-            else:
-                type_ = self._metadata.element_type
-            return _maybe_wrap(
-                annotated_type=type_, key=key, value=val, is_optional=True, parent=self,
-            )
-
         def assign(value_key: Any, value_to_assign: Any) -> None:
+            self._bump_generation()
             value_to_assign._set_parent(self)
             value_to_assign._set_key(value_key)
             self.__dict__["_content"][value_key] = value_to_assign
 
         try:
             if must_wrap:
-                self.__dict__["_content"][key] = wrap(key, value)
+                self._bump_generation()
+                self.__dict__["_content"][key] = self._wrap(key, value)
             elif input_node and target_node:
                 # both nodes, replace existing node with new one
                 assign(key, value)
@@ -396,7 +1004,8 @@ class BaseContainer(Container, ABC):
                 elif input_config:
                     assign(key, value)
                 else:
-                    self.__dict__["_content"][key] = wrap(key, value)
+                    self._bump_generation()
+                    self.__dict__["_content"][key] = self._wrap(key, value)
         except ValidationError as ve:
             import sys
 
@@ -404,6 +1013,138 @@ class BaseContainer(Container, ABC):
                 f"Error setting '{self._get_full_key(str(key))} = {value}' : {ve}"
             ).with_traceback(sys.exc_info()[2]) from None
 
+    def _wrap(self, key: Any, value: Any) -> Node:
+        from omegaconf.omegaconf import OmegaConf, _maybe_wrap
+
+        if is_structured_config(value):
+            type_ = OmegaConf.get_type(value)
+        else:
+            type_ = self._metadata.element_type
+        return _maybe_wrap(
+            annotated_type=type_, key=key, value=value, is_optional=True, parent=self,
+        )
+
+    def _wrap_lazy(self, key: Any, value: Any) -> Node:
+        """
+        Like _wrap(), but a primitive dict or list is wrapped in a lazy container
+        """
+        if type(value) in (dict, list, tuple):
+            return BaseContainer._create_lazy(value, key=key, parent=self)
+        if isinstance(value, Node):
+            # the input is shared by the copies of a lazy config, a node it contains
+            # is not attached as is
+            node: Node = copy.deepcopy(value)
+            node._set_parent(self)
+            node._set_key(key)
+            return node
+        return self._wrap(key, value)
+
+    @staticmethod
+    def _create_lazy(
+        value: Union[Dict[Any, Any], List[Any], Tuple[Any, ...]],
+        key: Any = None,
+        parent: Optional[Container] = None,
+    ) -> "BaseContainer":
+        """
+        Creates a container holding the primitive dict or list value as is, see
+        LazyContent.
+        """
+        from .dictconfig import DictConfig
+        from .listconfig import ListConfig
+
+        res: BaseContainer
+        if isinstance(value, dict):
+            res = DictConfig(content={}, key=key)
+        else:
+            res = ListConfig(content=[], key=key)
+        res.__dict__["_content"] = LazyContent(res, value)
+        # the parent is attached after the content is set:
+        # creating a node is not a modification of the parent config.
+        object.__setattr__(res, "_parent", parent)
+        return res
+
+    def _materialize(self) -> Any:
+        """
+        Creates the nodes of a lazy container, a no-op for other containers.
+        :return: the content of this container
+        """
+        content = self.__dict__["_content"]
+        if isinstance(content, LazyContent):
+            try:
+                content = content._create_nodes()
+            except Exception:
+                # keep the content as it was, using it again raises again
+                self.__dict__["_content"] = content
+                raise
+            self.__dict__["_content"] = content
+        return content
+
+    @abstractmethod
+    def _create_nodes(self, raw: Any) -> Any:
+        ...  # pragma: no cover
+
+    def _copy_on_write(self, parent: Optional[Container]) -> "BaseContainer":
+        """
+        Deep copies this container. The copy shares the nodes of this container until
+        the copy is used or this config is modified, see CopiedContent.
+        :param parent: parent of the copy
+        """
+        res: BaseContainer = type(self).__new__(type(self))
+        res.__dict__.update(self.__dict__)
+        res.__dict__["_metadata"] = self.__dict__["_metadata"]._clone()
+        res.__dict__["_parent"] = parent
+        res.__dict__["_hierarchy_cache"] = None
+        res.__dict__["_resolved_cache"] = copy.copy(self.__dict__["_resolved_cache"])
+        res.__dict__["_path_index"] = copy.deepcopy(self.__dict__["_path_index"])
+        res.__dict__["_pending_copies"] = None
+        if isinstance(self.__dict__["_content"], OverlayContent):
+            self._materialize()
+        content = self.__dict__["_content"]
+        if isinstance(content, CopiedContent):
+            # share the nodes this container shares
+            content = CopiedContent(res, content._raw)
+        elif isinstance(content, LazyContent):
+            content = LazyContent(res, content._raw)
+        elif isinstance(content, (dict, list)):
+            content = CopiedContent(res, self)
+        res.__dict__["_content"] = content
+        return res
+
+    def _restore(self, snapshot: "BaseContainer") -> None:
+        """
+        Replaces the content and the metadata of this container with those of
+        snapshot. Like a deep copy, the restored content shares the nodes of snapshot
+        until it is used.
+        """
+        if type(snapshot) is not type(self):
+            raise TypeError(
+                f"Cannot restore a {type(self).__name__} from a {type(snapshot).__name__}"
+            )
+        self._bump_generation()
+        res = snapshot._copy_on_write(parent=self.__dict__["_parent"])
+        key = self._key()
+        content = res.__dict__["_content"]
+        if isinstance(content, LazyContent):
+            content._container = self
+        self.__dict__["_content"] = content
+        self.__dict__["_kind"] = res.__dict__["_kind"]
+        self.__dict__["_metadata"] = res.__dict__["_metadata"]
+        self._set_key(key)
+        self._invalidate_hierarchy_caches()
+
+    def _copy_child(self, node: Node) -> Node:
+        """copy of node, a child of another container, with this container as parent"""
+        if isinstance(node, BaseContainer):
+            return node._copy_on_write(parent=self)
+        assert isinstance(node, ValueNode)
+        return node._clone(parent=self)
+
+    def _copy_nodes(self, source: "BaseContainer") -> Any:
+        content = source._materialize()
+        if isinstance(content, dict):
+            return {key: self._copy_child(node) for key, node in content.items()}
+        return [self._copy_child(node) for node in content]
+
     @staticmethod
     def _item_eq(
         c1: "BaseContainer",
@@ -460,20 +1201,39 @@ class BaseContainer(Container, ABC):
 
         # update parents of first level Config nodes to self
 
-        if isinstance(self, Container) and not self._is_missing():
+        if isinstance(self, BaseContainer):
+            content = self.__dict__["_content"]
+            if isinstance(content, LazyContent):
+                # the nodes are not created yet, they get this container as parent
+                content._container = self
+                return
+
+        if (
+            isinstance(self, Container)
+            and not self._is_interpolation()
+            and not self._is_missing()
+            and self.__dict__["_content"] is not None
+        ):
             if isinstance(self, DictConfig):
-                if (
-                    self.__dict__["_content"] is not None
-                    and not self._is_interpolation()
-                ):
-                    for _key, value in self.__dict__["_content"].items():
-                        value._set_parent(self)
-                        BaseContainer._re_parent(value)
+                for _key, value in self.__dict__["_content"].items():
+                    value._set_parent(self)
+                    BaseContainer._re_parent(value)
             elif isinstance(self, ListConfig):
                 for item in self.__dict__["_content"]:
                     item._set_parent(self)
                     BaseContainer._re_parent(item)
 
+    def _set_parent(self, parent: Optional["Container"]) -> None:
+        if parent is not self.__dict__["_parent"]:
+            # pending copies of the config this container leaves may share its nodes
+            pending = self._get_root().__dict__["_pending_copies"]
+            if pending is not None:
+                pending.complete()
+        super()._set_parent(parent)
+        # values cached while this container was a root are not valid under a new root
+        self.__dict__["_generation"] += 1
+        self.__dict__["_structure_generation"] += 1
+
     def _is_none(self) -> bool:
         return self.__dict__["_content"] is None
 
@@ -491,7 +1251,10 @@ class BaseContainer(Container, ABC):
         return self.__dict__["_metadata"].optional is True
 
     def _is_interpolation(self) -> bool:
-        return _is_interpolation(self.__dict__["_content"])
+        return self.__dict__["_kind"] in (
+            ValueKind.INTERPOLATION,
+            ValueKind.STR_INTERPOLATION,
+        )
 
     @abstractmethod
     def _validate_get(self, key: Any) -> None:
@@ -16,9 +16,11 @@ from typing import (
 )
 
 from ._utils import (
+    ValueKind,
     _is_interpolation,
     get_structured_config_data,
     get_type_of,
+    get_value_kind,
     is_primitive_dict,
     is_structured_config,
     is_structured_config_frozen,
@@ -86,13 +88,13 @@ class DictConfig(BaseContainer, MutableMapping[str, Any]):
                 metadata.element_type = element_type
                 metadata.object_type = None
                 metadata.key_type = key_type
+                self._invalidate_hierarchy_caches()
                 self.__dict__["_metadata"] = metadata
 
     def __deepcopy__(self, memo: Dict[int, Any] = {}) -> "DictConfig":
-        res = DictConfig({})
-        for k, v in self.__dict__.items():
-            res.__dict__[k] = copy.deepcopy(v, memo=memo)
-        res._re_parent()
+        parent = copy.deepcopy(self.__dict__["_parent"], memo=memo)
+        res = self._copy_on_write(parent)
+        assert isinstance(res, DictConfig)
         return res
 
     def __copy__(self) -> "DictConfig":
@@ -222,6 +224,18 @@ class DictConfig(BaseContainer, MutableMapping[str, Any]):
                 f"'{type(value).__name__}' is not a supported type (key: {self._get_full_key(key)}) : {ex}"
             )
 
+    def _create_nodes(self, raw: Dict[Any, Any]) -> Dict[Union[str, Enum], Node]:
+        nodes: Dict[Union[str, Enum], Node] = {}
+        for key, value in raw.items():
+            key = self._validate_and_normalize_key(key)
+            try:
+                nodes[key] = self._wrap_lazy(key, value)
+            except UnsupportedValueType as ex:
+                raise UnsupportedValueType(
+                    f"'{type(value).__name__}' is not a supported type (key: {self._get_full_key(key)}) : {ex}"
+                )
+        return nodes
+
     # hide content while inspecting in debugger
     def __dir__(self) -> Iterable[str]:
         if self._is_missing() or self._is_none():
@@ -296,6 +310,7 @@ class DictConfig(BaseContainer, MutableMapping[str, Any]):
         key = self._validate_and_normalize_key(key)
         if self._get_flag("readonly"):
             raise ReadonlyConfigError(self._get_full_key(key))
+        self._bump_generation()
         value = self._resolve_with_default(
             key=key,
             value=self.__dict__["_content"].pop(key, default),
@@ -402,6 +417,7 @@ class DictConfig(BaseContainer, MutableMapping[str, Any]):
     def _set_value(self, value: Any) -> None:
         from omegaconf import OmegaConf
 
+        self._bump_generation()
         self._metadata.object_type = self._metadata.annotated_type
         type_ = (
             self._metadata.object_type
@@ -415,10 +431,13 @@ class DictConfig(BaseContainer, MutableMapping[str, Any]):
                     f"Cannot assign {type_.__name__}=None (field is not Optional)"
                 )
             self.__dict__["_content"] = None
+            self.__dict__["_kind"] = ValueKind.VALUE
         elif _is_interpolation(value):
             self.__dict__["_content"] = value
+            self.__dict__["_kind"] = get_value_kind(value)
         elif value == "???":  # missing
             self.__dict__["_content"] = "???"
+            self.__dict__["_kind"] = ValueKind.MANDATORY_MISSING
         else:
             is_structured = is_structured_config(value)
             if is_structured:
@@ -427,6 +446,7 @@ class DictConfig(BaseContainer, MutableMapping[str, Any]):
 
             self._metadata.object_type = None
             self.__dict__["_content"] = {}
+            self.__dict__["_kind"] = ValueKind.VALUE
 
             for k, v in value.items():
                 self.__setitem__(k, v)
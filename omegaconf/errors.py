@@ -31,3 +31,9 @@ class UnsupportedInterpolationType(ValueError):
     """
     Thrown when an attempt to use an unregistered interpolation is made
     """
+
+
+class InterpolationCycleError(ValueError):
+    """
+    Thrown when interpolations reference each other in a cycle
+    """
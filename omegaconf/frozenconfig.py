@@ -0,0 +1,201 @@
+"""Immutable snapshots of configs, created by OmegaConf.freeze()."""
+from abc import abstractmethod
+from enum import Enum
+from typing import Any, Dict, Iterator, List, Mapping, Sequence, Tuple, Union, overload
+
+from .errors import ReadonlyConfigError
+
+
+class FrozenConfig:
+    """
+    Base class of the immutable, fully resolved config snapshots created by
+    OmegaConf.freeze().
+    All the nodes of a snapshot share an index of the values by their dotted key
+    from the root (e.g. "server.port" or "servers.0.port"), so select() is a single
+    dict lookup.
+    """
+
+    __slots__ = ("_index", "_prefix")
+
+    _index: Dict[str, Any]
+    # dotted key of this node followed by a ".", "" for the root
+    _prefix: str
+
+    def __init__(self, index: Dict[str, Any], prefix: str) -> None:
+        object.__setattr__(self, "_index", index)
+        object.__setattr__(self, "_prefix", prefix)
+
+    def select(self, key: str) -> Any:
+        """
+        Select a value using dot separated key sequence
+        :param key: dotted key relative to this node, e.g. "a.b" or "a.0"
+        :return: the value, or None if there is no value for key
+        """
+        if key == "":
+            return self
+        return self._index.get(self._prefix + key)
+
+    @abstractmethod
+    def _to_primitive(self, enum_to_str: bool) -> Union[Dict[str, Any], List[Any]]:
+        ...  # pragma: no cover
+
+    def _readonly_error(self, key: Any) -> ReadonlyConfigError:
+        return ReadonlyConfigError("{}{}".format(self._prefix, key))
+
+    def __setattr__(self, key: str, value: Any) -> None:
+        raise self._readonly_error(key)
+
+    def __delattr__(self, key: str) -> None:
+        raise self._readonly_error(key)
+
+    def __setitem__(self, key: Any, value: Any) -> None:
+        raise self._readonly_error(key)
+
+    def __delitem__(self, key: Any) -> None:
+        raise self._readonly_error(key)
+
+    def __eq__(self, other: Any) -> bool:
+        from .base import Container
+        from .omegaconf import OmegaConf
+
+        if isinstance(other, FrozenConfig):
+            other = other._to_primitive(enum_to_str=False)
+        elif isinstance(other, Container):
+            other = OmegaConf.to_container(other, resolve=True)
+        elif isinstance(other, tuple):
+            other = list(other)
+        elif not isinstance(other, (dict, list)):
+            return NotImplemented
+        return bool(self._to_primitive(enum_to_str=False) == other)
+
+    def __ne__(self, other: Any) -> bool:
+        x = self.__eq__(other)
+        if x is not NotImplemented:
+            return not x
+        return NotImplemented
+
+    __hash__ = None  # type: ignore
+
+    def __copy__(self) -> "FrozenConfig":
+        return self
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> "FrozenConfig":
+        return self
+
+    def __reduce__(self) -> Tuple[Any, Tuple[Any, ...]]:
+        # a pickled node is restored as the root of a new snapshot
+        return freeze_content, (self._to_primitive(enum_to_str=False),)
+
+
+class FrozenDictConfig(FrozenConfig, Mapping[Any, Any]):
+    __slots__ = ("_content",)
+
+    _content: Dict[Any, Any]
+
+    def __init__(
+        self, index: Dict[str, Any], prefix: str, content: Dict[Any, Any]
+    ) -> None:
+        super().__init__(index=index, prefix=prefix)
+        object.__setattr__(self, "_content", content)
+
+    def __getattr__(self, key: str) -> Any:
+        try:
+            return self._content[key]
+        except KeyError:
+            raise AttributeError(key) from None
+
+    def __getitem__(self, key: Any) -> Any:
+        return self._content[key]
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self._content)
+
+    def __len__(self) -> int:
+        return len(self._content)
+
+    def __repr__(self) -> str:
+        return repr(self._content)
+
+    def _to_primitive(self, enum_to_str: bool) -> Dict[Any, Any]:
+        return {
+            key: _to_primitive(value, enum_to_str)
+            for key, value in self._content.items()
+        }
+
+
+class FrozenListConfig(FrozenConfig, Sequence[Any]):
+    __slots__ = ("_content",)
+
+    _content: Tuple[Any, ...]
+
+    def __init__(
+        self, index: Dict[str, Any], prefix: str, content: Tuple[Any, ...]
+    ) -> None:
+        super().__init__(index=index, prefix=prefix)
+        object.__setattr__(self, "_content", content)
+
+    @overload
+    def __getitem__(self, index: int) -> Any:
+        ...  # pragma: no cover
+
+    @overload
+    def __getitem__(self, index: slice) -> Tuple[Any, ...]:
+        ...  # pragma: no cover
+
+    def __getitem__(self, index: Union[int, slice]) -> Any:
+        return self._content[index]
+
+    def __len__(self) -> int:
+        return len(self._content)
+
+    def __repr__(self) -> str:
+        return repr(list(self._content))
+
+    def _to_primitive(self, enum_to_str: bool) -> List[Any]:
+        return [_to_primitive(value, enum_to_str) for value in self._content]
+
+
+def _to_primitive(value: Any, enum_to_str: bool) -> Any:
+    if isinstance(value, FrozenConfig):
+        return value._to_primitive(enum_to_str)
+    if enum_to_str and isinstance(value, Enum):
+        return "{}.{}".format(type(value).__name__, value.name)
+    return value
+
+
+def _freeze(value: Any, key: str, index: Dict[str, Any]) -> Any:
+    prefix = key + "." if key != "" else ""
+    frozen: Any
+    if isinstance(value, dict):
+        frozen = FrozenDictConfig(
+            index,
+            prefix,
+            {
+                k: _freeze(
+                    v, prefix + (k.name if isinstance(k, Enum) else str(k)), index
+                )
+                for k, v in value.items()
+            },
+        )
+    elif isinstance(value, list):
+        frozen = FrozenListConfig(
+            index,
+            prefix,
+            tuple(_freeze(v, prefix + str(i), index) for i, v in enumerate(value)),
+        )
+    else:
+        frozen = value
+    if key != "":
+        index[key] = frozen
+    return frozen
+
+
+def freeze_content(content: Union[Dict[Any, Any], List[Any]]) -> FrozenConfig:
+    """
+    Creates a snapshot from a primitive container.
+    :param content: a resolved primitive container, as returned by
+                    OmegaConf.to_container(cfg, resolve=True)
+    """
+    frozen = _freeze(content, "", {})
+    assert isinstance(frozen, FrozenConfig)
+    return frozen
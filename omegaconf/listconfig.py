@@ -24,6 +24,9 @@ from .errors import (
 )
 from .nodes import AnyNode, ValueNode
 
+# Values wrapped in an AnyNode in an untyped list.
+_SCALAR_TYPES = (int, float, bool, str, type(None))
+
 
 class ListConfig(BaseContainer, MutableSequence[Any]):
     def __init__(
@@ -42,6 +45,20 @@ class ListConfig(BaseContainer, MutableSequence[Any]):
         )
         self._set_value(value=content)
 
+    def _normalize_index(self, index: int) -> int:
+        if index < 0:
+            return max(0, len(self) + index)
+        return min(index, len(self))
+
+    def _update_keys(self, start: int = 0) -> None:
+        """
+        Renumbers the keys of the nodes from start on, after nodes were added, removed
+        or moved in the list.
+        """
+        content = self.__dict__["_content"]
+        for index in range(start, len(content)):
+            content[index]._set_key(index)
+
     def _validate_get(self, index: Any) -> None:
         if not isinstance(index, (int, slice)):
             raise KeyValidationError(f"Key type {type(index).__name__} is invalid")
@@ -59,10 +76,9 @@ class ListConfig(BaseContainer, MutableSequence[Any]):
                     )
 
     def __deepcopy__(self, memo: Dict[int, Any] = {}) -> "ListConfig":
-        res = ListConfig(content=[])
-        for k, v in self.__dict__.items():
-            res.__dict__[k] = copy.deepcopy(v, memo=memo)
-        res._re_parent()
+        parent = copy.deepcopy(self.__dict__["_parent"], memo=memo)
+        res = self._copy_on_write(parent)
+        assert isinstance(res, ListConfig)
         return res
 
     def __getattr__(self, key: str) -> Any:
@@ -112,9 +128,20 @@ class ListConfig(BaseContainer, MutableSequence[Any]):
     def __setitem__(self, index: Union[int, slice], value: Any) -> None:
         self._set_at_index(index, value)
 
+    def __delitem__(self, key: Union[str, int, slice]) -> None:
+        start = 0
+        if isinstance(key, slice):
+            removed = range(*key.indices(len(self)))
+            start = min(removed) if len(removed) > 0 else len(self)
+        elif isinstance(key, int):
+            start = self._normalize_index(key)
+        super().__delitem__(key)
+        self._update_keys(start)
+
     def append(self, item: Any) -> None:
         index = len(self)
         self._validate_set(key=index, value=item)
+        self._bump_generation()
 
         try:
             from omegaconf.omegaconf import OmegaConf, _maybe_wrap
@@ -137,17 +164,82 @@ class ListConfig(BaseContainer, MutableSequence[Any]):
     def insert(self, index: int, item: Any) -> None:
         if self._get_flag("readonly"):
             raise ReadonlyConfigError(self._get_full_key(str(index)))
+        self._bump_generation()
+        start = self._normalize_index(index)
         try:
-            self._content.insert(index, AnyNode(None))
-            self._set_at_index(index, item)
+            self._content.insert(start, AnyNode(None))
+            self._set_at_index(start, item)
         except Exception:
-            del self.__dict__["_content"][index]
+            del self.__dict__["_content"][start]
             raise
+        self._update_keys(start)
+
+    def _create_nodes(self, raw: Union[List[Any], Tuple[Any, ...]]) -> List[Node]:
+        nodes = []
+        for index, item in enumerate(raw):
+            try:
+                nodes.append(self._wrap_lazy(index, item))
+            except UnsupportedValueType:
+                full_key = self._get_full_key(f"{index}")
+                raise UnsupportedValueType(
+                    f"{type(item).__name__} is not a supported type (key: {full_key})"
+                )
+        return nodes
 
     def extend(self, lst: Iterable[Any]) -> None:
         assert isinstance(lst, (tuple, list, ListConfig))
-        for x in lst:
-            self.append(x)
+        self._append_all(lst)
+
+    def _append_all(
+        self, items: Union[List[Any], Tuple[Any, ...], "ListConfig"]
+    ) -> None:
+        """
+        Appends all the items in a single batch, like calling append() for each.
+        The list is validated once for the batch, and the optional AnyNodes of a
+        ListConfig are copied without validating their values again.
+        """
+        from omegaconf.omegaconf import OmegaConf, _maybe_wrap
+
+        if self._get_flag("readonly"):
+            raise ReadonlyConfigError(self._get_full_key(f"{len(self)}"))
+        self._bump_generation()
+
+        element_type: Any = self._metadata.element_type
+        untyped = element_type in (Any, None)
+        from_config = False
+        if isinstance(items, ListConfig):
+            nodes = items._materialize()
+            from_config = isinstance(nodes, list)
+            # a copy, items may be this list
+            source = list(nodes) if from_config else list(items)
+        else:
+            source = list(items)
+        content = self.__dict__["_content"]
+        for item in source:
+            index = len(content)
+            if from_config:
+                if untyped and type(item) is AnyNode and item._metadata.optional:
+                    content.append(item._copy_to(key=index, parent=self))
+                    continue
+                if isinstance(item, ValueNode):
+                    item = item._value()
+            if untyped and type(item) in _SCALAR_TYPES:
+                content.append(AnyNode(value=item, key=index, parent=self))
+                continue
+            try:
+                node = _maybe_wrap(
+                    annotated_type=element_type,
+                    key=index,
+                    value=item,
+                    is_optional=OmegaConf.is_optional(item),
+                    parent=self,
+                )
+            except UnsupportedValueType:
+                full_key = self._get_full_key(f"{index}")
+                raise UnsupportedValueType(
+                    f"{type(item).__name__} is not a supported type (key: {full_key})"
+                )
+            content.append(node)
 
     def remove(self, x: Any) -> None:
         del self[self.index(x)]
@@ -182,6 +274,13 @@ class ListConfig(BaseContainer, MutableSequence[Any]):
                 c = c + 1
         return c
 
+    def __copy__(self) -> "ListConfig":
+        # shallow, the copy shares the nodes of this list
+        self._materialize()
+        res: ListConfig = ListConfig.__new__(ListConfig)
+        res.__dict__.update(self.__dict__)
+        return res
+
     def copy(self) -> "ListConfig":
         return copy.copy(self)
 
@@ -200,15 +299,18 @@ class ListConfig(BaseContainer, MutableSequence[Any]):
             raise ReadonlyConfigError(
                 self._get_full_key(str(index if index != -1 else ""))
             )
-        return self._resolve_with_default(
-            key=index, value=self._content.pop(index), default_value=None
-        )
+        self._bump_generation()
+        start = self._normalize_index(index)
+        node = self._content.pop(index)
+        self._update_keys(start)
+        return self._resolve_with_default(key=index, value=node, default_value=None)
 
     def sort(
         self, key: Optional[Callable[[Any], Any]] = None, reverse: bool = False
     ) -> None:
         if self._get_flag("readonly"):
             raise ReadonlyConfigError()
+        self._bump_generation()
 
         if key is None:
 
@@ -221,6 +323,7 @@ class ListConfig(BaseContainer, MutableSequence[Any]):
                 return key(x._value())  # type: ignore
 
         self._content.sort(key=key1, reverse=reverse)
+        self._update_keys()
 
     def __eq__(self, other: Any) -> bool:
         if isinstance(other, (list, tuple)) or other is None:
@@ -275,24 +378,26 @@ class ListConfig(BaseContainer, MutableSequence[Any]):
     def _set_value(self, value: Any) -> None:
         from omegaconf import OmegaConf
 
+        self._bump_generation()
         if OmegaConf.is_none(value):
             if not self._is_optional():
                 raise ValidationError(
                     "Non optional ListConfig cannot be constructed from None"
                 )
             self.__dict__["_content"] = None
-        elif get_value_kind(value) == ValueKind.MANDATORY_MISSING:
+            self.__dict__["_kind"] = ValueKind.VALUE
+            return
+
+        value_kind = get_value_kind(value)
+        self.__dict__["_kind"] = value_kind
+        if value_kind == ValueKind.MANDATORY_MISSING:
             self.__dict__["_content"] = "???"
-        elif get_value_kind(value) in (
-            ValueKind.INTERPOLATION,
-            ValueKind.STR_INTERPOLATION,
-        ):
+        elif value_kind in (ValueKind.INTERPOLATION, ValueKind.STR_INTERPOLATION):
             self.__dict__["_content"] = value
         else:
             assert is_primitive_list(value) or isinstance(value, ListConfig)
             self.__dict__["_content"] = []
-            for item in value:
-                self.append(item)
+            self._append_all(value)
 
     @staticmethod
     def _list_eq(l1: Optional["ListConfig"], l2: Optional["ListConfig"]) -> bool:
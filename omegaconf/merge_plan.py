@@ -0,0 +1,86 @@
+"""Base configs compiled for repeated merges, created by OmegaConf.compile_merge_plan()."""
+import copy
+from enum import Enum
+from typing import Any, Dict, Optional
+
+from .basecontainer import BaseContainer
+from .dictconfig import DictConfig
+from .nodes import ValueNode
+
+# Plan of a dict: key -> plan of its dict node, or None for a value node.
+# Other keys are merged the regular way.
+_Plan = Dict[Any, Optional[Dict[Any, Any]]]
+
+
+def _is_scalar(value: Any) -> bool:
+    return value is None or isinstance(value, (int, float, bool, str, Enum))
+
+
+def _compile(cfg: DictConfig) -> _Plan:
+    plan: _Plan = {}
+    for key, node in cfg._materialize().items():
+        if isinstance(node, ValueNode):
+            plan[key] = None
+        elif (
+            isinstance(node, DictConfig)
+            and not node._is_none()
+            and not node._is_missing()
+            and not node._is_interpolation()
+            and not node._get_flag("readonly")
+        ):
+            plan[key] = _compile(node)
+    return plan
+
+
+class MergePlan:
+    """
+    A base config compiled to be merged with many overrides.
+    The plan keeps a private copy of the base and knows the paths of its value nodes
+    and of the dicts an override can be merged into: merging a primitive dict
+    override sets the values it overrides directly, at the cost of the size of the
+    override. Other overrides are merged the regular way.
+    Changes to the base config after the plan is compiled are not reflected in the
+    merged configs.
+    """
+
+    def __init__(self, base: DictConfig) -> None:
+        assert isinstance(base, DictConfig)
+        self._base = copy.deepcopy(base)
+        self._plan = _compile(self._base)
+
+    def merge(self, *overrides: Any) -> DictConfig:
+        """
+        Merges overrides into a copy of the base config, like
+        OmegaConf.merge(base, *overrides).
+        :param overrides: configs, dicts or structured configs
+        :return: the merged config
+        """
+        res = copy.deepcopy(self._base)
+        structure = res.__dict__["_structure_generation"]
+        for override in overrides:
+            # the plan no longer applies once the structure of the result changed
+            if (
+                type(override) is dict
+                and res.__dict__["_structure_generation"] == structure
+            ):
+                self._apply(res, self._plan, override)
+            else:
+                res.merge_with(override)
+        return res
+
+    def _apply(
+        self, dest: BaseContainer, plan: _Plan, override: Dict[Any, Any]
+    ) -> None:
+        for key, value in override.items():
+            if key in plan:
+                sub_plan = plan[key]
+                node = dest._materialize()[key]
+                if sub_plan is None and _is_scalar(value):
+                    assert isinstance(node, ValueNode)
+                    node._set_value(value)
+                    continue
+                if sub_plan is not None and type(value) is dict:
+                    assert isinstance(node, DictConfig)
+                    self._apply(node, sub_plan, value)
+                    continue
+            dest.merge_with({key: value})
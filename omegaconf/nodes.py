@@ -1,9 +1,10 @@
 import copy
 import math
 from enum import Enum
+from functools import lru_cache
 from typing import Any, Dict, Optional, Type, Union
 
-from omegaconf._utils import _is_interpolation
+from omegaconf._utils import ValueKind, get_value_kind
 from omegaconf.base import Container, Metadata, Node
 from omegaconf.errors import (
     MissingMandatoryValue,
@@ -12,34 +13,44 @@ from omegaconf.errors import (
 )
 
 
+@lru_cache(maxsize=None)
+def _enum_fields(enum_type: Type[Enum]) -> Dict[str, Any]:
+    return {name: constant.value for name, constant in enum_type.__members__.items()}
+
+
 class ValueNode(Node):
+    # Value nodes are the leaves of a config and are by far the most numerous
+    # objects, slots keep them small.
+    __slots__ = ("_metadata", "_parent", "_hierarchy_cache", "_val", "_kind")
+
     _val: Any
 
     def __init__(
         self, parent: Optional[Container], value: Any, key: Any, is_optional: bool
     ):
-        super().__init__(
-            parent=parent, metadata=Metadata(key=key, optional=is_optional)
-        )
+        # the parent is attached after the initial value is set:
+        # initializing a node is not a modification of the parent config.
+        super().__init__(parent=None, metadata=Metadata(key=key, optional=is_optional))
         self._set_value(value)
+        self._parent = parent
 
     def _value(self) -> Any:
         return self._val
 
     def _set_value(self, value: Any) -> None:
-        from ._utils import ValueKind, get_value_kind
+        if isinstance(value, str):
+            kind = get_value_kind(value)
+        else:
+            kind = ValueKind.VALUE
 
-        if isinstance(value, str) and get_value_kind(value) in (
-            ValueKind.INTERPOLATION,
-            ValueKind.STR_INTERPOLATION,
-            ValueKind.MANDATORY_MISSING,
-        ):
+        self._bump_generation(structure=False)
+        if kind is not ValueKind.VALUE:
             self._val = value
         else:
-
             if not self._metadata.optional and value is None:
                 raise ValidationError("Non optional field cannot be assigned None")
             self._val = self.validate_and_convert(value)
+        self._kind = kind
 
     def validate_and_convert(self, value: Any) -> Any:
         """
@@ -69,8 +80,21 @@ class ValueNode(Node):
     def __hash__(self) -> int:
         return hash(self._val)
 
-    def _deepcopy_impl(self, res: Any, memo: Optional[Dict[int, Any]] = {}) -> None:
-        res.__dict__ = copy.deepcopy(self.__dict__, memo=memo)
+    def _clone(self, parent: Optional[Container]) -> "ValueNode":
+        """
+        Copy of this node with the given parent.
+        Values are immutable and shared with the copy, only the metadata is copied.
+        """
+        res: ValueNode = object.__new__(type(self))
+        res._metadata = self._metadata._clone()
+        res._parent = parent
+        res._hierarchy_cache = None
+        res._val = self._val
+        res._kind = self._kind
+        return res
+
+    def __deepcopy__(self, memo: Dict[int, Any] = {}) -> "ValueNode":
+        return self._clone(parent=copy.deepcopy(self._parent, memo=memo))
 
     def _is_none(self) -> bool:
         node = self._dereference_node()
@@ -93,10 +117,12 @@ class ValueNode(Node):
         return ret
 
     def _is_interpolation(self) -> bool:
-        return _is_interpolation(self._value())
+        return self._kind in (ValueKind.INTERPOLATION, ValueKind.STR_INTERPOLATION)
 
 
 class AnyNode(ValueNode):
+    __slots__ = ()
+
     def __init__(
         self,
         value: Any = None,
@@ -115,13 +141,25 @@ class AnyNode(ValueNode):
             )
         return value
 
-    def __deepcopy__(self, memo: Dict[int, Any] = {}) -> "AnyNode":
-        res = AnyNode()
-        self._deepcopy_impl(res, memo)
+    def _copy_to(self, key: Any, parent: Optional[Container]) -> "AnyNode":
+        """
+        Copy of this node with a new key and parent, without its flags.
+        The value was validated by this node and is not validated again.
+        """
+        res: AnyNode = AnyNode.__new__(AnyNode)
+        Node.__init__(
+            res,
+            parent=parent,
+            metadata=Metadata(key=key, optional=self._metadata.optional),
+        )
+        res._val = self._val
+        res._kind = self._kind
         return res
 
 
 class StringNode(ValueNode):
+    __slots__ = ()
+
     def __init__(
         self,
         value: Any = None,
@@ -134,13 +172,10 @@ class StringNode(ValueNode):
     def validate_and_convert(self, value: Any) -> Optional[str]:
         return str(value) if value is not None else None
 
-    def __deepcopy__(self, memo: Dict[int, Any] = {}) -> "StringNode":
-        res = StringNode()
-        self._deepcopy_impl(res, memo)
-        return res
-
 
 class IntegerNode(ValueNode):
+    __slots__ = ()
+
     def __init__(
         self,
         value: Any = None,
@@ -164,13 +199,10 @@ class IntegerNode(ValueNode):
             ) from None
         return val
 
-    def __deepcopy__(self, memo: Dict[int, Any] = {}) -> "IntegerNode":
-        res = IntegerNode()
-        self._deepcopy_impl(res, memo)
-        return res
-
 
 class FloatNode(ValueNode):
+    __slots__ = ()
+
     def __init__(
         self,
         value: Any = None,
@@ -211,13 +243,10 @@ class FloatNode(ValueNode):
     def __hash__(self) -> int:
         return hash(self._val)
 
-    def __deepcopy__(self, memo: Dict[int, Any] = {}) -> "FloatNode":
-        res = FloatNode()
-        self._deepcopy_impl(res, memo)
-        return res
-
 
 class BooleanNode(ValueNode):
+    __slots__ = ()
+
     def __init__(
         self,
         value: Any = None,
@@ -251,11 +280,6 @@ class BooleanNode(ValueNode):
                 f"Value '{value}' is not a valid bool (type {type(value).__name__})"
             )
 
-    def __deepcopy__(self, memo: Dict[int, Any] = {}) -> "BooleanNode":
-        res = BooleanNode()
-        self._deepcopy_impl(res, memo)
-        return res
-
 
 class EnumNode(ValueNode):  # lgtm [py/missing-equals] : Intentional.
     """
@@ -265,6 +289,8 @@ class EnumNode(ValueNode):  # lgtm [py/missing-equals] : Intentional.
     This is intentional, Please open an issue against OmegaConf if you wish to discuss this decision.
     """
 
+    __slots__ = ("enum_type",)
+
     def __init__(
         self,
         enum_type: Type[Enum],
@@ -277,15 +303,25 @@ class EnumNode(ValueNode):  # lgtm [py/missing-equals] : Intentional.
             raise ValidationError(
                 f"EnumNode can only operate on Enum subclasses ({enum_type})"
             )
-        self.fields: Dict[str, str] = {}
         self.enum_type: Type[Enum] = enum_type
-        for name, constant in enum_type.__members__.items():
-            self.fields[name] = constant.value
         super().__init__(parent=parent, is_optional=is_optional, value=value, key=key)
 
+    @property
+    def fields(self) -> Dict[str, Any]:
+        """
+        Enum member name -> member value, shared by all the nodes of the enum type
+        """
+        return _enum_fields(self.enum_type)
+
     def validate_and_convert(self, value: Any) -> Optional[Enum]:
         return self.validate_and_convert_to_enum(enum_type=self.enum_type, value=value)
 
+    def _clone(self, parent: Optional[Container]) -> "EnumNode":
+        res = super()._clone(parent)
+        assert isinstance(res, EnumNode)
+        res.enum_type = self.enum_type
+        return res
+
     @staticmethod
     def validate_and_convert_to_enum(
         enum_type: Type[Enum], value: Any
@@ -322,8 +358,3 @@ class EnumNode(ValueNode):  # lgtm [py/missing-equals] : Intentional.
             raise ValidationError(
                 f"Invalid value '{value}', expected one of:\n{valid}"
             ) from None
-
-    def __deepcopy__(self, memo: Dict[int, Any] = {}) -> "EnumNode":
-        res = EnumNode(enum_type=self.enum_type)
-        self._deepcopy_impl(res, memo)
-        return res
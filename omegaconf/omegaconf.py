@@ -6,6 +6,7 @@ import pathlib
 import re
 import sys
 from collections import defaultdict
+from concurrent.futures import Executor
 from contextlib import contextmanager
 from enum import Enum
 from typing import (
@@ -26,7 +27,8 @@ from typing import (
 import yaml
 from typing_extensions import Protocol
 
-from . import DictConfig, ListConfig
+from . import DictConfig, ListConfig, _instrumentation
+from ._resolver_cache import CachingResolver, ResolverCache
 from ._utils import (
     ValueKind,
     _get_key_value_types,
@@ -43,6 +45,13 @@ from ._utils import (
 from .base import Container, Node
 from .basecontainer import BaseContainer
 from .errors import UnsupportedInterpolationType, ValidationError
+from .frozenconfig import (
+    FrozenConfig,
+    FrozenDictConfig,
+    FrozenListConfig,
+    freeze_content,
+)
+from .merge_plan import MergePlan
 from .nodes import (
     AnyNode,
     BooleanNode,
@@ -127,28 +136,46 @@ class OmegaConf:
     @staticmethod
     @overload
     def create(
-        obj: Union[List[Any], Tuple[Any, ...]], parent: Optional[BaseContainer] = None
+        obj: Union[List[Any], Tuple[Any, ...]],
+        parent: Optional[BaseContainer] = None,
+        lazy: bool = False,
     ) -> ListConfig:
         ...  # pragma: no cover
 
     @staticmethod
     @overload
     def create(
-        obj: Union[BaseContainer, str], parent: Optional[BaseContainer] = None
+        obj: Union[BaseContainer, str],
+        parent: Optional[BaseContainer] = None,
+        lazy: bool = False,
     ) -> Union[DictConfig, ListConfig]:
         ...  # pragma: no cover
 
     @staticmethod
     @overload
     def create(
-        obj: Union[Dict[str, Any], None] = None, parent: Optional[BaseContainer] = None
+        obj: Union[Dict[str, Any], None] = None,
+        parent: Optional[BaseContainer] = None,
+        lazy: bool = False,
     ) -> DictConfig:
         ...  # pragma: no cover
 
     @staticmethod
     def create(  # noqa F811
-        obj: Any = _EMPTY_MARKER_, parent: Optional[BaseContainer] = None
+        obj: Any = _EMPTY_MARKER_,
+        parent: Optional[BaseContainer] = None,
+        lazy: bool = False,
     ) -> Union[DictConfig, ListConfig]:
+        """
+        Creates a config from a dict, a list, a structured config, a config or a
+        yaml string.
+        :param obj: the input
+        :param parent: parent of the created config
+        :param lazy: True to create the nodes of a dict or a list input (and of the
+                     dicts and lists it contains) only when they are first used.
+                     The input must not be modified afterwards. The values are
+                     validated when their nodes are created.
+        """
         from ._utils import get_yaml_loader
         from .dictconfig import DictConfig
         from .listconfig import ListConfig
@@ -163,9 +190,13 @@ class OmegaConf:
                 return OmegaConf.create({obj: None})
             else:
                 assert isinstance(obj, (list, dict))
-                return OmegaConf.create(obj)
+                return OmegaConf.create(obj, lazy=lazy)
 
         else:
+            if lazy and type(obj) in (dict, list, tuple):
+                res = BaseContainer._create_lazy(obj, parent=parent)
+                assert isinstance(res, (DictConfig, ListConfig))
+                return res
             if (
                 is_primitive_dict(obj)
                 or OmegaConf.is_dict(obj)
@@ -196,19 +227,24 @@ class OmegaConf:
 
     @staticmethod
     def load(
-        file_: Union[str, pathlib.Path, IO[bytes]]
+        file_: Union[str, pathlib.Path, IO[bytes]], lazy: bool = False
     ) -> Union[DictConfig, ListConfig]:
+        """
+        Loads a config from a yaml file
+        :param file_: filename or file object
+        :param lazy: True to create the nodes when they are first used, see create()
+        """
         from ._utils import get_yaml_loader
 
         if isinstance(file_, (str, pathlib.Path)):
             with io.open(os.path.abspath(file_), "r", encoding="utf-8") as f:
                 obj = yaml.load(f, Loader=get_yaml_loader())
                 assert isinstance(obj, (list, dict, str))
-                return OmegaConf.create(obj)
+                return OmegaConf.create(obj, lazy=lazy)
         elif getattr(file_, "read", None):
             obj = yaml.load(file_, Loader=get_yaml_loader())
             assert isinstance(obj, (list, dict, str))
-            return OmegaConf.create(obj)
+            return OmegaConf.create(obj, lazy=lazy)
         else:
             raise TypeError("Unexpected file type")
 
@@ -263,6 +299,41 @@ class OmegaConf:
         target.merge_with(*others[1:])
         return target
 
+    @staticmethod
+    def overlay(
+        base: DictConfig, *overrides: Union[DictConfig, Dict[str, Any], Any]
+    ) -> DictConfig:
+        """
+        Creates a config presenting base with the overrides applied on top of it, in order,
+        like OmegaConf.merge(base, *overrides).
+        Creating the overlay costs the size of the overrides: the base is shared and each
+        level of the overlay is merged when it is first used. Interpolations resolve
+        against the overlay, and changes to the overlay do not affect base.
+        :param base: the base config
+        :param overrides: configs, dicts or structured configs overriding values of base
+        :return: the overlay, a DictConfig
+        """
+        from .basecontainer import OverlayContent
+
+        assert isinstance(base, DictConfig)
+        res = copy.deepcopy(base)
+        for override in overrides:
+            if isinstance(override, DictConfig):
+                layer = copy.deepcopy(override)
+            else:
+                layer = OmegaConf.create(override, lazy=True)
+            if not isinstance(layer, DictConfig):
+                raise ValidationError(
+                    f"Cannot overlay {type(layer).__name__} on a DictConfig"
+                )
+            if res._is_none() or res._is_missing() or res._is_interpolation():
+                res.merge_with(layer)
+            else:
+                res.__dict__["_content"] = OverlayContent(
+                    res, res.__dict__["_content"], layer
+                )
+        return res
+
     @staticmethod
     def _tokenize_args(string: Optional[str]) -> List[str]:
         if string is None or string == "":
@@ -278,23 +349,47 @@ class OmegaConf:
         return [re.sub(r"(\\([ ,]))", lambda x: x.group(2), x) for x in escaped]
 
     @staticmethod
-    def register_resolver(name: str, resolver: Resolver) -> None:
+    def register_resolver(
+        name: str,
+        resolver: Resolver,
+        use_cache: bool = True,
+        cache_size: Optional[int] = None,
+        cache_ttl: Optional[float] = None,
+        pure: bool = False,
+    ) -> None:
+        """
+        Registers a resolver, used in interpolations like ${name:arg1,arg2}.
+        By default resolver results are cached in the root of the config, keyed by the
+        argument string, and kept for the lifetime of the config.
+        :param name: name of the resolver
+        :param resolver: called with the arguments of the interpolation,
+                         can be a coroutine function
+        :param use_cache: False to call the resolver every time the interpolation is resolved
+        :param cache_size: maximum number of cached results, the least recently used results
+                           are evicted first
+        :param cache_ttl: number of seconds after which a cached result expires
+        :param pure: True if the result only depends on the arguments. Results of pure
+                     resolvers are cached once per process and shared by all configs
+        """
         assert callable(resolver), "resolver must be callable"
         # noinspection PyProtectedMember
         assert (
             name not in BaseContainer._resolvers
         ), "resolved {} is already registered".format(name)
-
-        def caching(config: BaseContainer, key: str) -> Any:
-            cache = OmegaConf.get_cache(config)[name]
-            val = (
-                cache[key] if key in cache else resolver(*OmegaConf._tokenize_args(key))
-            )
-            cache[key] = val
-            return val
+        assert use_cache or (
+            cache_size is None and cache_ttl is None
+        ), "cache_size and cache_ttl require use_cache=True"
+        assert use_cache or not pure, "pure resolvers require use_cache=True"
 
         # noinspection PyProtectedMember
-        BaseContainer._resolvers[name] = caching
+        BaseContainer._resolvers[name] = CachingResolver(
+            name=name,
+            resolver=resolver,
+            use_cache=use_cache,
+            cache_size=cache_size,
+            cache_ttl=cache_ttl,
+            pure=pure,
+        )
 
     @staticmethod
     def get_resolver(name: str) -> Optional[Callable[[Container, Any], Any]]:
@@ -311,11 +406,14 @@ class OmegaConf:
 
     @staticmethod
     def get_cache(conf: BaseContainer) -> Dict[str, Any]:
-        return conf._metadata.resolver_cache
+        root = conf._get_root()
+        if root._metadata.resolver_cache is None:
+            root._metadata.resolver_cache = defaultdict(dict)
+        return root._metadata.resolver_cache
 
     @staticmethod
     def set_cache(conf: BaseContainer, cache: Dict[str, Any]) -> None:
-        conf._metadata.resolver_cache = copy.deepcopy(cache)
+        conf._get_root()._metadata.resolver_cache = copy.deepcopy(cache)
 
     @staticmethod
     def clear_cache(conf: BaseContainer) -> None:
@@ -325,6 +423,76 @@ class OmegaConf:
     def copy_cache(from_config: BaseContainer, to_config: BaseContainer) -> None:
         OmegaConf.set_cache(to_config, OmegaConf.get_cache(from_config))
 
+    @staticmethod
+    def get_cache_stats(conf: BaseContainer) -> Dict[str, Dict[str, int]]:
+        """
+        Returns the resolver cache statistics of a config.
+        :param conf: the config (or any node in it)
+        :return: resolver name -> dict with hits, misses, evictions and size counters
+        """
+        return {
+            name: store.stats()
+            for name, store in OmegaConf.get_cache(conf).items()
+            if isinstance(store, ResolverCache)
+        }
+
+    @staticmethod
+    def set_instrumentation(enabled: bool) -> None:
+        """
+        Enables or disables the collection of resolver and interpolation statistics.
+        Enabling instrumentation discards previously collected statistics.
+        :param enabled: True to enable instrumentation, False to disable it
+        """
+        _instrumentation.recorder = _instrumentation.Recorder() if enabled else None
+
+    @staticmethod
+    def get_instrumentation() -> Dict[str, Any]:
+        """
+        Returns the statistics collected since instrumentation was enabled:
+        resolvers: resolver name -> calls, cache_hits, cache_misses, total_time and the
+                   p50, p90 and p99 latencies of the calls, in seconds
+        interpolations: count and max_depth of the interpolation references resolved
+        :return: the statistics, an empty dict if instrumentation is disabled
+        """
+        recorder = _instrumentation.recorder
+        return {} if recorder is None else recorder.to_dict()
+
+    @staticmethod
+    def set_resolved_cache(conf: Container, enabled: bool) -> None:
+        """
+        Enables or disables caching of resolved interpolation values for a config.
+        The cache is kept at the root of the config and is invalidated whenever the
+        config is modified.
+        :param conf: the config (or any node in it)
+        :param enabled: True to enable the cache, False to disable and drop it
+        """
+        from .basecontainer import ResolvedCache
+
+        root = conf._get_root()
+        if not enabled:
+            root.__dict__["_resolved_cache"] = None
+        elif root.__dict__["_resolved_cache"] is None:
+            root.__dict__["_resolved_cache"] = ResolvedCache()
+
+    @staticmethod
+    def set_path_index(conf: Container, enabled: bool) -> None:
+        """
+        Enables or disables the path index of a config.
+        The index is kept at the root of the config and maps the dotted keys selected
+        from the root (including by interpolations) to their nodes, making repeated
+        selects of the same key a dict lookup. It is cleared when nodes are added,
+        removed or moved in the config.
+        :param conf: the config (or any node in it)
+        :param enabled: True to enable the index, False to disable and drop it
+        """
+        from .basecontainer import PathIndex
+
+        root = conf._get_root()
+        if not enabled:
+            root.__dict__["_path_index"] = None
+        elif root.__dict__["_path_index"] is None:
+            root.__dict__["_path_index"] = PathIndex()
+
     @staticmethod
     def set_readonly(conf: Node, value: Optional[bool]) -> None:
         # noinspection PyProtectedMember
@@ -365,18 +533,172 @@ class OmegaConf:
 
     @staticmethod
     def to_container(
-        cfg: Container, resolve: bool = False, enum_to_str: bool = False
+        cfg: Union[Container, FrozenConfig],
+        resolve: bool = False,
+        enum_to_str: bool = False,
+        max_workers: Optional[int] = None,
+        executor: Optional[Executor] = None,
     ) -> Union[Dict[str, Any], List[Any]]:
         """
         Resursively converts an OmegaConf config to a primitive container (dict or list).
+        :param cfg: the config to convert, or a frozen config
+        :param resolve: True to resolve all values (frozen configs are always resolved)
+        :param enum_to_str: True to convert Enum values to strings
+        :param max_workers: if resolving, call the resolvers in parallel on a pool of
+                            max_workers threads
+        :param executor: if resolving, call the resolvers in parallel on this executor
+        :return: A dict or a list representing this config as a primitive container.
+        """
+        from ._resolution import prefetching_resolver
+
+        if isinstance(cfg, FrozenConfig):
+            # noinspection PyProtectedMember
+            return cfg._to_primitive(enum_to_str=enum_to_str)
+        assert isinstance(cfg, Container)
+        resolver = None
+        if resolve:
+            resolver = prefetching_resolver(cfg, max_workers, executor)
+        # noinspection PyProtectedMember
+        return BaseContainer._to_content(
+            cfg, resolve=resolve, enum_to_str=enum_to_str, resolver=resolver
+        )
+
+    @staticmethod
+    def resolve(
+        cfg: Container,
+        max_workers: Optional[int] = None,
+        executor: Optional[Executor] = None,
+    ) -> None:
+        """
+        Resolves all interpolations in the given config in-place.
+        Each interpolation is resolved once, interpolations referencing each other in
+        a cycle raise an InterpolationCycleError.
+        Resolvers doing blocking I/O can be called in parallel by passing max_workers
+        or an executor. Results are written to the config in the same order as without.
+        :param cfg: the config to resolve (DictConfig or ListConfig)
+        :param max_workers: call the resolvers in parallel on a pool of max_workers threads
+        :param executor: call the resolvers in parallel on this executor
+        """
+        from ._resolution import prefetching_resolver
+
+        if not OmegaConf.is_config(cfg):
+            raise ValueError(f"Invalid config type ({type(cfg).__name__})")
+        prefetching_resolver(cfg, max_workers, executor).resolve_in_place(cfg)
+
+    @staticmethod
+    async def aresolve(cfg: Container) -> None:
+        """
+        Resolves all interpolations in the given config in-place, like
+        OmegaConf.resolve(). Async resolvers are called concurrently on the running
+        event loop.
+        :param cfg: the config to resolve (DictConfig or ListConfig)
+        """
+        from ._resolution import BulkResolver, call_async_resolvers
+
+        if not OmegaConf.is_config(cfg):
+            raise ValueError(f"Invalid config type ({type(cfg).__name__})")
+        results = await call_async_resolvers(cfg)
+        BulkResolver(resolver_results=results).resolve_in_place(cfg)
+
+    @staticmethod
+    async def ato_container(
+        cfg: Container, enum_to_str: bool = False
+    ) -> Union[Dict[str, Any], List[Any]]:
+        """
+        Resolves and converts an OmegaConf config to a primitive container, like
+        OmegaConf.to_container(cfg, resolve=True). Async resolvers are called
+        concurrently on the running event loop.
         :param cfg: the config to convert
-        :param resolve: True to resolve all values
         :param enum_to_str: True to convert Enum values to strings
         :return: A dict or a list representing this config as a primitive container.
         """
+        from ._resolution import BulkResolver, call_async_resolvers
+
         assert isinstance(cfg, Container)
+        results = await call_async_resolvers(cfg)
         # noinspection PyProtectedMember
-        return BaseContainer._to_content(cfg, resolve=resolve, enum_to_str=enum_to_str)
+        return BaseContainer._to_content(
+            cfg,
+            resolve=True,
+            enum_to_str=enum_to_str,
+            resolver=BulkResolver(resolver_results=results),
+        )
+
+    @staticmethod
+    @overload
+    def freeze(cfg: DictConfig) -> FrozenDictConfig:
+        ...  # pragma: no cover
+
+    @staticmethod
+    @overload
+    def freeze(cfg: ListConfig) -> FrozenListConfig:
+        ...  # pragma: no cover
+
+    @staticmethod
+    @overload
+    def freeze(cfg: Container) -> FrozenConfig:
+        ...  # pragma: no cover
+
+    @staticmethod
+    def freeze(cfg: Container) -> FrozenConfig:  # noqa F811
+        """
+        Creates an immutable snapshot of a config with all interpolations resolved.
+        Values are read with attribute or item access, or with OmegaConf.select() which
+        is a single dict lookup. Changes to cfg are not reflected in the snapshot.
+        :param cfg: the config to freeze
+        :return: a FrozenDictConfig or a FrozenListConfig
+        """
+        return freeze_content(OmegaConf.to_container(cfg, resolve=True))
+
+    @staticmethod
+    def snapshot(cfg: Container) -> Union[DictConfig, ListConfig]:
+        """
+        Takes a snapshot of a config, to be restored with OmegaConf.restore().
+        The snapshot shares the nodes of cfg: taking it is O(1), and when cfg is
+        modified only the nodes on the path to the modified node are copied.
+        :param cfg: the config
+        :return: the snapshot, a copy of cfg
+        """
+        assert isinstance(cfg, (DictConfig, ListConfig))
+        return copy.deepcopy(cfg)
+
+    @staticmethod
+    def restore(cfg: Container, snapshot: Container) -> None:
+        """
+        Restores the content and the flags of a config from a snapshot.
+        The restored config shares the nodes of the snapshot, which is not modified and
+        can be restored again.
+        The nodes of cfg are replaced: nodes of cfg referenced before the restore are no
+        longer part of it.
+        :param cfg: the config to restore
+        :param snapshot: a snapshot of cfg, taken with OmegaConf.snapshot()
+        """
+        assert isinstance(cfg, BaseContainer)
+        assert isinstance(snapshot, BaseContainer)
+        cfg._restore(snapshot)
+
+    @staticmethod
+    def compile_merge_plan(base: DictConfig) -> MergePlan:
+        """
+        Compiles a base config to be merged with many overrides:
+        OmegaConf.compile_merge_plan(base).merge(override) is like
+        OmegaConf.merge(base, override), but merging a dict override only costs the
+        size of the override.
+        Changes to base are not reflected in the configs merged by the plan.
+        :param base: the base config
+        :return: a MergePlan
+        """
+        return MergePlan(base)
+
+    @staticmethod
+    def select(cfg: Union[Container, FrozenConfig], key: str) -> Any:
+        """
+        Select a value using dot separated key sequence
+        :param cfg: the config or frozen config to select from
+        :param key: dotted key, e.g. "a.b" or "a.0"
+        :return: the value, or None if there is no value for key
+        """
+        return cfg.select(key)
 
     @staticmethod
     def is_missing(cfg: BaseContainer, key: Union[int, str]) -> bool:
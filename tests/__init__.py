@@ -5,6 +5,10 @@ from typing import Any, Dict, Iterator, List, Optional
 
 from omegaconf import II, MISSING
 
+# Keys of the __dict__ of a container holding caches, which are not part of the state
+# of the config and differ between a config and its copies.
+CONTAINER_CACHE_KEYS = {"_pending_copies"}
+
 
 class IllegalType:
     def __init__(self) -> None:
@@ -1,4 +1,5 @@
 import copy
+import pickle
 from typing import Any, Dict, List, Union
 
 import pytest
@@ -17,8 +18,9 @@ from omegaconf import (
     open_dict,
     read_write,
 )
+from omegaconf.basecontainer import CopiedContent
 
-from . import StructuredWithMissing, does_not_raise
+from . import CONTAINER_CACHE_KEYS, StructuredWithMissing, User, does_not_raise
 
 
 @pytest.mark.parametrize(  # type: ignore
@@ -175,6 +177,69 @@ def test_freeze_nested_dict(flag: str) -> None:
     assert c.a._get_flag(flag)
 
 
+@pytest.mark.parametrize("flag", ["readonly", "struct"])  # type: ignore
+def test_cached_flag_invalidated(flag: str) -> None:
+    c = OmegaConf.create({"a": {"b": {"c": 1}}, "x": {"y": 1}})
+    node = c.a.b.get_node("c")
+    assert node._get_flag(flag) is None
+    c._set_flag(flag, True)
+    assert node._get_flag(flag) is True
+    c.a._set_flag(flag, False)
+    assert node._get_flag(flag) is False
+
+    # moving the subtree under a parent with a different flag
+    other = OmegaConf.create({})
+    other._set_flag(flag, True)
+    c.a.b._set_parent(other)
+    assert node._get_flag(flag) is True
+
+
+def test_cached_root_invalidated() -> None:
+    c1 = OmegaConf.create({"a": {"b": 1}})
+    c2 = OmegaConf.create({})
+    a = c1.a
+    assert a._get_root() is c1
+    a._set_parent(c2)
+    assert a._get_root() is c2
+
+
+def test_hierarchy_caches_invalidated_per_root() -> None:
+    c1 = OmegaConf.create({"a": {"b": 1}})
+    c2 = OmegaConf.create({"x": {"y": 1}})
+    OmegaConf.set_struct(c1, True)
+    node = c1.a.get_node("b")
+    assert node._get_flag("struct") is True
+    cache = node._hierarchy_cache
+    # changes to another config keep the caches of this one
+    OmegaConf.set_readonly(c2, True)
+    c2.x._set_parent(c2)
+    assert node._get_flag("struct") is True
+    assert node._hierarchy_cache is cache
+    OmegaConf.set_struct(c1, False)
+    assert node._get_flag("struct") is False
+    assert node._hierarchy_cache is not cache
+
+
+def test_cached_root_of_moved_root() -> None:
+    c1 = OmegaConf.create({"a": {"b": 1}})
+    c2 = OmegaConf.create({})
+    assert c1.a._get_root() is c1
+    c1._set_parent(c2)
+    assert c1.a._get_root() is c2
+
+
+def test_cached_flag_invalidated_by_merge() -> None:
+    c = OmegaConf.create({"a": {"b": 1}})
+    OmegaConf.set_struct(c, True)
+    assert c.a.get_node("b")._get_flag("struct") is True
+    merged = OmegaConf.merge(c, {"a": {"b": 2}})
+    node = merged.a.get_node("b")
+    assert node._get_flag("struct") is True
+    assert merged.a._get_root() is merged
+    OmegaConf.set_struct(merged, False)
+    assert node._get_flag("struct") is False
+
+
 @pytest.mark.parametrize(
     "src", [[], [1, 2, 3], dict(), dict(a=10), StructuredWithMissing]
 )
@@ -185,7 +250,7 @@ class TestDeepCopy:
         assert c1 == c2
 
         assert c1.__dict__.keys() == c2.__dict__.keys()
-        for k in c1.__dict__.keys():
+        for k in c1.__dict__.keys() - CONTAINER_CACHE_KEYS:
             assert c1.__dict__[k] == c2.__dict__[k]
 
         assert id(c1) != id(c2)
@@ -260,6 +325,138 @@ def test_deepcopy_and_merge_and_flags() -> None:
         OmegaConf.merge(c2, OmegaConf.from_dotlist(["dataset.bad_key=yes"]))
 
 
+def _is_shared(cfg: Any) -> bool:
+    return isinstance(cfg.__dict__["_content"], CopiedContent)
+
+
+def test_deepcopy_copy_on_write() -> None:
+    c1 = OmegaConf.create({"a": {"b": {"c": 1}}, "d": {"e": [1, 2]}, "f": "${a.b.c}"})
+    c2 = copy.deepcopy(c1)
+    assert _is_shared(c2)
+    c2.a.b.c = 2
+    # only the path to the modified node is copied
+    assert not _is_shared(c2.a.b)
+    assert _is_shared(c2.get_node("d"))
+    assert c2.f == 2
+    assert c1.f == 1
+    assert c2.a.b._get_root() is c2
+    assert c2 == {"a": {"b": {"c": 2}}, "d": {"e": [1, 2]}, "f": "${a.b.c}"}
+    assert c1 == {"a": {"b": {"c": 1}}, "d": {"e": [1, 2]}, "f": "${a.b.c}"}
+
+
+@pytest.mark.parametrize(  # type: ignore
+    "modify",
+    [
+        lambda c: c.d.e.append(3),
+        lambda c: c.d.__setattr__("e", 10),
+        lambda c: c.d.__delitem__("e"),
+        lambda c: c.merge_with({"d": {"e": "x"}}),
+        lambda c: OmegaConf.set_readonly(c.d.get_node("e"), True),
+        lambda c: OmegaConf.create({"x": None}).__setattr__("x", c.d),
+        lambda c: c.merge_with({"d": User}),
+    ],
+)
+def test_deepcopy_source_modified(modify: Any) -> None:
+    c1 = OmegaConf.create({"a": 1, "d": {"e": [1, 2]}})
+    c2 = copy.deepcopy(c1)
+    c3 = copy.deepcopy(c2)
+    modify(c1)
+    assert c2 == {"a": 1, "d": {"e": [1, 2]}}
+    assert c3 == {"a": 1, "d": {"e": [1, 2]}}
+    assert not OmegaConf.is_readonly(c2.d.get_node("e"))
+
+
+def test_deepcopy_source_merged_with_structured_config() -> None:
+    c1 = OmegaConf.create({"a": {"x": 1}})
+    c2 = copy.deepcopy(c1)
+    c3 = copy.deepcopy(c1)
+    _ = c3.a
+    c1.merge_with({"a": User})
+    assert c1 == {"a": {"name": "???", "age": "???"}}
+    assert c2 == {"a": {"x": 1}}
+    assert c3 == {"a": {"x": 1}}
+
+
+def test_deepcopy_of_modified_copy() -> None:
+    c1 = OmegaConf.create({"a": {"b": 1}, "c": {"d": 2}})
+    c2 = copy.deepcopy(c1)
+    c2.a.b = 10
+    c3 = copy.deepcopy(c2)
+    c2.c.d = 20
+    assert c1 == {"a": {"b": 1}, "c": {"d": 2}}
+    assert c2 == {"a": {"b": 10}, "c": {"d": 20}}
+    assert c3 == {"a": {"b": 10}, "c": {"d": 2}}
+
+
+def test_deepcopy_moved_node() -> None:
+    c1 = OmegaConf.create({"a": {"b": 1}})
+    c2 = copy.deepcopy(c1)
+    c3 = copy.deepcopy(c2.a)
+    c1.a.b = 2
+    c2.a.b = 3
+    assert c3 == {"b": 1}
+    assert c3._get_parent() is not c2
+
+
+def test_snapshot_and_restore() -> None:
+    cfg = OmegaConf.create({"a": {"b": 1, "c": {"d": 2}}, "e": [1, 2], "f": "${a.b}"})
+    snapshots: List[Any] = []
+    for i in range(5):
+        snapshots.append(OmegaConf.snapshot(cfg))
+        cfg.a.b = i + 10
+    # the snapshots only copied the path to the modified node
+    for snapshot in snapshots[1:]:
+        assert not _is_shared(snapshot.get_node("a"))
+        assert _is_shared(snapshot.a.get_node("c"))
+        assert _is_shared(snapshot.get_node("e"))
+
+    OmegaConf.set_readonly(cfg.a, True)
+    cfg.e.append(3)
+    OmegaConf.restore(cfg, snapshots[2])
+    assert cfg == {"a": {"b": 11, "c": {"d": 2}}, "e": [1, 2], "f": "${a.b}"}
+    assert cfg.f == 11
+    assert not OmegaConf.is_readonly(cfg.a)
+    cfg.a.c.d = 3
+    assert snapshots[2].a.c.d == 2
+    OmegaConf.restore(cfg, snapshots[0])
+    assert cfg.a == {"b": 1, "c": {"d": 2}}
+    assert cfg.a._get_root() is cfg
+
+
+def test_restore_node() -> None:
+    cfg = OmegaConf.create({"a": {"b": [1, 2]}, "c": 1})
+    snapshot = OmegaConf.snapshot(cfg.a.b)
+    cfg.a.b.append(3)
+    OmegaConf.restore(cfg.a.b, snapshot)
+    assert cfg == {"a": {"b": [1, 2]}, "c": 1}
+    assert cfg.a.b._key() == "b"
+    assert cfg.a.b._get_parent() is cfg.a
+    with pytest.raises(TypeError):
+        OmegaConf.restore(cfg.a, snapshot)
+
+
+def test_restore_after_structured_merge() -> None:
+    cfg = OmegaConf.create({"a": {"b": {"x": 1}}})
+    snapshot = OmegaConf.snapshot(cfg.a)
+    root_snapshot = OmegaConf.snapshot(cfg)
+    cfg.merge_with({"a": {"b": User}})
+    assert cfg.a.b == {"name": "???", "age": "???"}
+    assert snapshot == {"b": {"x": 1}}
+    assert root_snapshot == {"a": {"b": {"x": 1}}}
+    OmegaConf.restore(cfg.a, snapshot)
+    assert cfg == {"a": {"b": {"x": 1}}}
+    cfg.merge_with({"a": {"b": User}})
+    OmegaConf.restore(cfg, root_snapshot)
+    assert cfg == {"a": {"b": {"x": 1}}}
+
+
+def test_pickle_copy() -> None:
+    c1 = OmegaConf.create({"a": {"b": [1, {"c": 2}]}})
+    c2 = pickle.loads(pickle.dumps(copy.deepcopy(c1)))
+    assert c2 == c1
+    assert c2.a.b[1]._get_root() is c2
+
+
 @pytest.mark.parametrize(  # type: ignore
     "cfg",
     [
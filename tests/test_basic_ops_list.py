@@ -214,6 +214,23 @@ def test_extend(src: List[Any], append: List[Any], result: List[Any]) -> None:
     assert lst == result
 
 
+def test_extend_with_list_config() -> None:
+    src = OmegaConf.create({"a": 10, "l": [1, "${a}", {"b": 2}, [3]]})
+    OmegaConf.set_readonly(src.l.get_node(0), True)
+    lst = OmegaConf.create([0])
+    lst.extend(src.l)
+    lst.extend(lst)
+    assert OmegaConf.to_container(lst) == [0, 1, "${a}", {"b": 2}, [3]] * 2
+    for index in range(len(lst)):
+        node = lst.get_node(index)
+        assert node._key() == index
+        assert node._get_parent() is lst
+    assert lst.get_node(1) is not src.l.get_node(0)
+    assert lst.get_node(1)._get_node_flag("readonly") is None
+    lst[1] = 5
+    assert src.l[0] == 1
+
+
 @pytest.mark.parametrize(  # type: ignore
     "src, remove, result, expectation",
     [
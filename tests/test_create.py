@@ -1,14 +1,17 @@
 """Testing for OmegaConf"""
+import copy
+import pickle
 import re
 import sys
 from typing import Any, Dict, List
 
 import pytest
 
-from omegaconf import OmegaConf
+from omegaconf import DictConfig, ListConfig, OmegaConf
+from omegaconf.basecontainer import LazyContent
 from omegaconf.errors import UnsupportedValueType
 
-from . import IllegalType
+from . import IllegalType, User
 
 
 @pytest.mark.parametrize(  # type: ignore
@@ -112,3 +115,78 @@ def test_create_from_oc_with_flags() -> None:
     c2 = OmegaConf.create(c1)
     assert c1 == c2
     assert c1._metadata.flags == c2._metadata.flags
+
+
+def test_create_lazy() -> None:
+    data = {"a": {"b": [1, {"c": "${a.b.0}"}]}, "d": {"e": 2}, "l": [[1]]}
+    c = OmegaConf.create(data, lazy=True)
+    assert isinstance(c, DictConfig)
+    assert isinstance(c.__dict__["_content"], LazyContent)
+    assert c.a.b[1].c == 1
+    assert not isinstance(c.a.__dict__["_content"], LazyContent)
+    # nodes which were not accessed are not created
+    assert isinstance(c.get_node("d").__dict__["_content"], LazyContent)
+    assert c.a.b._get_full_key(1) == "a.b[1]"
+    assert c == OmegaConf.create(data)
+    assert OmegaConf.to_container(c) == data
+
+
+def test_create_lazy_list() -> None:
+    c = OmegaConf.create([1, {"a": 2}, [3]], lazy=True)
+    assert isinstance(c, ListConfig)
+    assert len(c) == 3
+    assert c[1].a == 2
+    c.insert(0, 0)
+    assert c == [0, 1, {"a": 2}, [3]]
+
+
+def test_create_lazy_modify() -> None:
+    data = {"a": {"b": 1}, "c": [1, 2]}
+    c = OmegaConf.create(data, lazy=True)
+    c.a.b = 10
+    c.c.append(3)
+    c.x = {"y": 1}
+    del c["a"]
+    assert c == {"c": [1, 2, 3], "x": {"y": 1}}
+    # the input is not modified
+    assert data == {"a": {"b": 1}, "c": [1, 2]}
+
+
+def test_create_lazy_copies() -> None:
+    c = OmegaConf.create({"a": {"b": 1}, "c": [{"d": 1}]}, lazy=True)
+    for c2 in (copy.deepcopy(c), c.copy(), pickle.loads(pickle.dumps(c))):
+        assert c2 == c
+        c2.a.b = 2
+        assert c2.a._get_root() is c2
+        assert c.a.b == 1
+
+
+def test_create_lazy_merge() -> None:
+    c = OmegaConf.create({"a": {"b": 1}, "c": {"d": 2}}, lazy=True)
+    res = OmegaConf.merge(c, {"a": {"b": 10}})
+    assert res == {"a": {"b": 10}, "c": {"d": 2}}
+    assert c == {"a": {"b": 1}, "c": {"d": 2}}
+
+
+def test_create_lazy_validates_on_access() -> None:
+    c = OmegaConf.create({"a": {"b": IllegalType()}, "c": 1}, lazy=True)
+    assert c.c == 1
+    with pytest.raises(UnsupportedValueType, match=re.escape("key: a.b")):
+        c.a.b
+    with pytest.raises(UnsupportedValueType, match=re.escape("key: [1]")):
+        OmegaConf.create([1, IllegalType()], lazy=True)[0]
+
+
+def test_create_lazy_structured_is_not_lazy() -> None:
+    user: Any = User(name="Bond", age=7)
+    c = OmegaConf.create(user, lazy=True)
+    assert not isinstance(c.__dict__["_content"], LazyContent)
+    assert OmegaConf.get_type(c) is User
+
+
+def test_load_lazy(tmpdir: Any) -> None:
+    path = tmpdir / "cfg.yaml"
+    path.write_text("a:\n  b: [1, 2]\n", encoding="utf-8")
+    c = OmegaConf.load(str(path), lazy=True)
+    assert isinstance(c.__dict__["_content"], LazyContent)
+    assert c.a.b == [1, 2]
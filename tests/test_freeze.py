@@ -0,0 +1,135 @@
+import copy
+import pickle
+from typing import Any
+
+import pytest
+from pytest import raises
+
+from omegaconf import (
+    FrozenConfig,
+    FrozenDictConfig,
+    FrozenListConfig,
+    MissingMandatoryValue,
+    OmegaConf,
+    ReadonlyConfigError,
+)
+
+from . import Color
+
+
+def test_freeze_dict() -> None:
+    cfg = OmegaConf.create({"a": {"b": 1, "c": [1, {"d": 2}]}, "e": Color.RED})
+    frozen = OmegaConf.freeze(cfg)
+    assert isinstance(frozen, FrozenDictConfig)
+    assert isinstance(frozen.a, FrozenDictConfig)
+    assert isinstance(frozen.a.c, FrozenListConfig)
+    assert frozen.a.b == 1
+    assert frozen["a"]["c"][1].d == 2
+    assert frozen.e == Color.RED
+    assert list(frozen.keys()) == ["a", "e"]
+    assert len(frozen.a.c) == 2
+
+
+def test_freeze_list() -> None:
+    frozen = OmegaConf.freeze(OmegaConf.create([1, [2, 3], {"a": 4}]))
+    assert isinstance(frozen, FrozenListConfig)
+    assert frozen[0] == 1
+    assert frozen[1][1] == 3
+    assert frozen[2].a == 4
+    assert frozen[0:2] == (1, frozen[1])
+
+
+def test_freeze_resolves_interpolations(restore_resolvers: Any) -> None:
+    OmegaConf.register_resolver("upper", lambda x: x.upper())
+    cfg = OmegaConf.create(
+        {"host": "localhost", "url": "http://${host}/", "a": "${upper:a}", "b": "${a}"}
+    )
+    frozen = OmegaConf.freeze(cfg)
+    assert frozen == {
+        "host": "localhost",
+        "url": "http://localhost/",
+        "a": "A",
+        "b": "A",
+    }
+
+
+def test_freeze_missing_value() -> None:
+    cfg = OmegaConf.create({"a": "???"})
+    with raises(MissingMandatoryValue):
+        OmegaConf.freeze(cfg)
+
+
+def test_freeze_is_a_snapshot() -> None:
+    cfg = OmegaConf.create({"a": {"b": 1}})
+    frozen = OmegaConf.freeze(cfg)
+    cfg.a.b = 2
+    assert frozen.a.b == 1
+
+
+@pytest.mark.parametrize(  # type: ignore
+    "key, expected",
+    [
+        ("", {"a": {"b": 1, "c": [10, {"d": 20}]}}),
+        ("a", {"b": 1, "c": [10, {"d": 20}]}),
+        ("a.b", 1),
+        ("a.c", [10, {"d": 20}]),
+        ("a.c.0", 10),
+        ("a.c.1.d", 20),
+        ("a.x", None),
+        ("a.c.2", None),
+        ("x.y.z", None),
+    ],
+)
+def test_select(key: str, expected: Any) -> None:
+    cfg = OmegaConf.create({"a": {"b": 1, "c": [10, {"d": 20}]}})
+    frozen = OmegaConf.freeze(cfg)
+    assert OmegaConf.select(frozen, key) == expected
+    assert OmegaConf.select(cfg, key) == expected
+
+
+def test_select_from_nested_node() -> None:
+    frozen = OmegaConf.freeze(OmegaConf.create({"a": {"b": [{"c": 1}]}}))
+    assert frozen.a.select("b.0.c") == 1
+    assert frozen.a.b.select("0.c") == 1
+    assert frozen.a.b.select("c") is None
+
+
+def test_immutable() -> None:
+    frozen = OmegaConf.freeze(OmegaConf.create({"a": {"b": 1}, "c": [1]}))
+    with raises(ReadonlyConfigError, match="a.b"):
+        frozen.a.b = 2
+    with raises(ReadonlyConfigError, match="a.b"):
+        frozen.a["b"] = 2
+    with raises(ReadonlyConfigError, match="a"):
+        del frozen["a"]
+    with raises(ReadonlyConfigError, match="c.0"):
+        frozen.c[0] = 2
+
+
+@pytest.mark.parametrize(  # type: ignore
+    "src", [{"a": {"b": [1, 2]}, "c": Color.RED}, [1, {"a": [2]}]]
+)
+def test_to_container_and_eq(src: Any) -> None:
+    cfg = OmegaConf.create(src)
+    frozen = OmegaConf.freeze(cfg)
+    assert OmegaConf.to_container(frozen) == src
+    assert frozen == src
+    assert frozen == cfg
+    assert cfg == frozen
+    assert frozen == OmegaConf.freeze(cfg)
+    assert frozen != OmegaConf.freeze(OmegaConf.create({"x": 1}))
+
+
+def test_to_container_enum_to_str() -> None:
+    frozen = OmegaConf.freeze(OmegaConf.create({"a": [Color.RED]}))
+    assert OmegaConf.to_container(frozen, enum_to_str=True) == {"a": ["Color.RED"]}
+
+
+def test_copy_and_pickle() -> None:
+    frozen = OmegaConf.freeze(OmegaConf.create({"a": {"b": [1, 2]}}))
+    assert copy.copy(frozen) is frozen
+    assert copy.deepcopy(frozen) is frozen
+    loaded = pickle.loads(pickle.dumps(frozen))
+    assert isinstance(loaded, FrozenConfig)
+    assert loaded == frozen
+    assert loaded.select("a.b.1") == 2
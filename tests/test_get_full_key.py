@@ -49,6 +49,16 @@ class TestGetFullKey:
         assert isinstance(c, DictConfig)
         assert c.b._get_full_key(key="") == "b"
 
+    def test_ld_empty_key(self) -> None:
+        c = OmegaConf.create([1, 2, dict(a=1)])
+        assert isinstance(c, ListConfig)
+        assert c[2]._get_full_key("") == "[2]"
+
+    def test_dl_value_node_empty_key(self) -> None:
+        c = OmegaConf.create(dict(a=[1, 2, 3]))
+        assert isinstance(c, DictConfig)
+        assert c.a.get_node(0)._get_full_key("") == "a[0]"
+
     # 3
     def test_ddd(self) -> None:
         c = OmegaConf.create(dict(a=dict(b=dict(c=1))))
@@ -97,3 +107,37 @@ class TestGetFullKey:
         c = OmegaConf.create(dict(x="???", a=1, b=dict(c=1)))
         assert isinstance(c, DictConfig)
         assert c.b._get_full_key("c") == "b.c"
+
+    def test_list_insert(self) -> None:
+        c = OmegaConf.create(dict(a=[dict(b=1), dict(b=2)]))
+        c.a.insert(0, dict(b=0))
+        c.a.insert(-1, dict(b=3))
+        assert [c.a[i]._get_full_key("b") for i in range(4)] == [
+            "a[0].b",
+            "a[1].b",
+            "a[2].b",
+            "a[3].b",
+        ]
+
+    def test_list_pop_and_del(self) -> None:
+        c = OmegaConf.create([[0], [1], [2], [3], [4]])
+        assert isinstance(c, ListConfig)
+        c.pop(0)
+        del c[1]
+        del c[-1]
+        assert c[0]._get_full_key(0) == "[0][0]"
+        assert c[1]._get_full_key(0) == "[1][0]"
+        del c[:1]
+        assert c[0]._get_full_key(0) == "[0][0]"
+
+    def test_list_sort(self) -> None:
+        c = OmegaConf.create(dict(a=[3, 1, 2]))
+        c.a.sort()
+        assert [c.a.get_node(i)._key() for i in range(3)] == [0, 1, 2]
+
+    def test_merge_structured_into_nested(self) -> None:
+        from . import User
+
+        c = OmegaConf.create(dict(a=dict(name="Bond", age=7)))
+        c.a.merge_with(User)
+        assert c.a._get_full_key("age") == "a.age"
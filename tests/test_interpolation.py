@@ -1,5 +1,10 @@
+import asyncio
+import copy
 import os
 import random
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Dict
 
 import pytest
@@ -8,10 +13,16 @@ from omegaconf import (
     DictConfig,
     IntegerNode,
     ListConfig,
+    MissingMandatoryValue,
     OmegaConf,
+    ReadonlyConfigError,
     Resolver,
+    StringNode,
     ValidationError,
 )
+from omegaconf._interpolation import InterpolationRef, parse_interpolation
+from omegaconf.basecontainer import BaseContainer, ResolvedCache
+from omegaconf.errors import InterpolationCycleError
 
 
 def test_str_interpolation_dict_1() -> None:
@@ -266,6 +277,297 @@ def test_resolver_that_allows_a_list_of_arguments(
     assert c[name] == result
 
 
+def test_resolver_no_cache(restore_resolvers: Any) -> None:
+    OmegaConf.register_resolver(
+        "random", lambda _: random.randint(0, 10000000), use_cache=False
+    )
+    c = OmegaConf.create(dict(k="${random:_}"))
+    assert c.k != c.k
+    assert OmegaConf.get_cache_stats(c) == {}
+
+
+def test_resolver_cache_size(restore_resolvers: Any) -> None:
+    OmegaConf.register_resolver("id", lambda x: [x], cache_size=2)
+    c = OmegaConf.create(dict(a="${id:a}", b="${id:b}", c="${id:c}"))
+    a = c.a
+    assert c.a is a
+    c.b
+    c.c
+    assert c.a is not a
+    assert OmegaConf.get_cache_stats(c) == {
+        "id": {"hits": 1, "misses": 4, "evictions": 2, "size": 2}
+    }
+
+
+def test_resolver_cache_ttl(restore_resolvers: Any, mocker: Any) -> None:
+    OmegaConf.register_resolver("id", lambda x: [x], cache_ttl=10)
+    monotonic = mocker.patch("time.monotonic", return_value=100.0)
+    c = OmegaConf.create(dict(a="${id:a}"))
+    a = c.a
+    monotonic.return_value = 109.0
+    assert c.a is a
+    monotonic.return_value = 110.0
+    assert c.a is not a
+    assert OmegaConf.get_cache_stats(c)["id"]["evictions"] == 1
+
+
+def test_resolver_cache_in_root_only(restore_resolvers: Any) -> None:
+    OmegaConf.register_resolver("random", lambda _: random.randint(0, 10000000))
+    c = OmegaConf.create(dict(a=dict(k="${random:_}"), b=[{"k": "${random:_}"}]))
+    assert c.a.k == c.b[0].k
+    assert c.a._metadata.resolver_cache is None
+    assert c.b._metadata.resolver_cache is None
+    assert OmegaConf.get_cache(c.a) is OmegaConf.get_cache(c)
+    assert OmegaConf.get_cache_stats(c.b) == {
+        "random": {"hits": 1, "misses": 1, "evictions": 0, "size": 1}
+    }
+
+
+def test_pure_resolver_cache_shared(restore_resolvers: Any, mocker: Any) -> None:
+    resolver = mocker.Mock(side_effect=lambda x: [x])
+    OmegaConf.register_resolver("id", resolver, pure=True)
+    c1 = OmegaConf.create(dict(k="${id:foo}"))
+    c2 = OmegaConf.merge(c1, {"other": 1})
+    c3 = copy.deepcopy(c1)
+    assert c1.k is c2.k
+    assert c1.k is c3.k
+    assert resolver.call_count == 1
+    assert OmegaConf.get_cache_stats(c1) == {}
+
+    # clearing the cache of a config does not affect pure resolvers
+    OmegaConf.clear_cache(c1)
+    assert c1.k is c2.k
+    assert resolver.call_count == 1
+
+
+def test_pure_resolver_cache_size(restore_resolvers: Any, mocker: Any) -> None:
+    resolver = mocker.Mock(side_effect=lambda x: [x])
+    OmegaConf.register_resolver("id", resolver, pure=True, cache_size=1)
+    c1 = OmegaConf.create(dict(a="${id:a}", b="${id:b}"))
+    c2 = OmegaConf.create(dict(a="${id:a}"))
+    a = c1.a
+    assert c2.a is a
+    c1.b
+    assert c2.a is not a
+    assert resolver.call_count == 3
+
+
+def _run(coroutine: Any) -> Any:
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
+
+
+def _register_async_counter() -> Dict[str, int]:
+    """
+    Registers an async resolver "secret" that records how many calls ran concurrently
+    """
+    counter = {"calls": 0, "running": 0, "max_running": 0}
+
+    async def secret(name: str) -> str:
+        counter["calls"] += 1
+        counter["running"] += 1
+        counter["max_running"] = max(counter["max_running"], counter["running"])
+        await asyncio.sleep(0.01)
+        counter["running"] -= 1
+        return "secret_" + name
+
+    OmegaConf.register_resolver("secret", secret)
+    return counter
+
+
+def test_async_resolver_aresolve(restore_resolvers: Any) -> None:
+    counter = _register_async_counter()
+    cfg = OmegaConf.create(
+        {
+            "a": "${secret:a}",
+            "b": ["${secret:b}", "${secret:a}"],
+            "url": "http://${secret:c}/${b.0}",
+            "ref": "${a}",
+        }
+    )
+    _run(OmegaConf.aresolve(cfg))
+    assert cfg == {
+        "a": "secret_a",
+        "b": ["secret_b", "secret_a"],
+        "url": "http://secret_c/secret_b",
+        "ref": "secret_a",
+    }
+    assert counter["calls"] == 3
+    assert counter["max_running"] == 3
+
+
+def test_async_resolver_ato_container(restore_resolvers: Any) -> None:
+    counter = _register_async_counter()
+    cfg = OmegaConf.create({"a": "${secret:a}", "b": "${secret:b}"})
+    res = _run(OmegaConf.ato_container(cfg))
+    assert res == {"a": "secret_a", "b": "secret_b"}
+    assert counter["max_running"] == 2
+    # results are cached in the config
+    assert cfg.a == "secret_a"
+    assert counter["calls"] == 2
+
+
+def test_async_resolver_aresolve_error(restore_resolvers: Any) -> None:
+    async def fail(_: str) -> Any:
+        raise IOError("failed")
+
+    OmegaConf.register_resolver("fail", fail)
+    cfg = OmegaConf.create({"a": "${fail:a}"})
+    with pytest.raises(IOError, match="failed"):
+        _run(OmegaConf.aresolve(cfg))
+
+
+def test_async_resolver_sync_access(restore_resolvers: Any) -> None:
+    _register_async_counter()
+    cfg = OmegaConf.create({"a": "${secret:a}"})
+    assert cfg.a == "secret_a"
+
+
+def test_async_resolver_sync_access_in_event_loop(restore_resolvers: Any) -> None:
+    _register_async_counter()
+    cfg = OmegaConf.create({"a": "${secret:a}"})
+
+    async def access() -> Any:
+        return cfg.a
+
+    with pytest.raises(RuntimeError, match=re.escape("OmegaConf.aresolve()")):
+        _run(access())
+
+
+@pytest.mark.parametrize("use_executor", [False, True])  # type: ignore
+def test_resolve_with_thread_pool(restore_resolvers: Any, use_executor: bool) -> None:
+    # all three calls must run at the same time to pass the barrier
+    barrier = threading.Barrier(3, timeout=5)
+
+    def blocking(name: str) -> str:
+        barrier.wait()
+        return "value_" + name
+
+    OmegaConf.register_resolver("blocking", blocking)
+    cfg = OmegaConf.create(
+        {"a": "${blocking:a}", "b": {"c": "${blocking:c}"}, "d": ["${blocking:d}"]}
+    )
+    if use_executor:
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            OmegaConf.resolve(cfg, executor=executor)
+    else:
+        OmegaConf.resolve(cfg, max_workers=3)
+    assert cfg == {"a": "value_a", "b": {"c": "value_c"}, "d": ["value_d"]}
+    assert list(cfg.keys()) == ["a", "b", "d"]
+
+
+def test_to_container_with_thread_pool(restore_resolvers: Any) -> None:
+    OmegaConf.register_resolver("upper", lambda x: x.upper())
+    cfg = OmegaConf.create({"a": "${upper:a}", "b": "${upper:b}", "c": "${a}"})
+    res = OmegaConf.to_container(cfg, resolve=True, max_workers=2)
+    assert res == {"a": "A", "b": "B", "c": "A"}
+    assert OmegaConf.get_cache_stats(cfg)["upper"]["misses"] == 2
+
+
+def test_resolve_with_thread_pool_error(restore_resolvers: Any) -> None:
+    calls = []
+
+    def fail(_: str) -> Any:
+        calls.append(1)
+        raise IOError("failed")
+
+    OmegaConf.register_resolver("fail", fail)
+    cfg = OmegaConf.create({"a": "${fail:a}"})
+    with pytest.raises(IOError, match="failed"):
+        OmegaConf.resolve(cfg, max_workers=2)
+    assert len(calls) == 1
+
+
+def test_resolve_subtree_with_thread_pool(restore_resolvers: Any) -> None:
+    calls = []
+
+    def record(x: str) -> str:
+        calls.append(x)
+        return x
+
+    OmegaConf.register_resolver("record", record)
+    cfg = OmegaConf.create(
+        {"a": "${record:a}", "sub": {"b": "${record:b}", "c": "${x}"}, "x": 1}
+    )
+    OmegaConf.resolve(cfg.sub, max_workers=2)
+    assert cfg.sub == {"b": "b", "c": 1}
+    assert calls == ["b"]
+
+
+@pytest.fixture  # type: ignore
+def instrumentation() -> Any:
+    OmegaConf.set_instrumentation(True)
+    yield
+    OmegaConf.set_instrumentation(False)
+
+
+def test_instrumentation_resolvers(
+    restore_resolvers: Any, instrumentation: Any
+) -> None:
+    OmegaConf.register_resolver("upper", lambda x: x.upper())
+    OmegaConf.register_resolver("lower", lambda x: x.lower(), use_cache=False)
+    cfg = OmegaConf.create({"a": "${upper:a}", "b": "${lower:B}"})
+    for _ in range(3):
+        assert cfg.a == "A"
+        assert cfg.b == "b"
+    stats = OmegaConf.get_instrumentation()["resolvers"]
+    assert stats["upper"]["calls"] == 1
+    assert stats["upper"]["cache_hits"] == 2
+    assert stats["upper"]["cache_misses"] == 1
+    assert stats["lower"]["calls"] == 3
+    assert stats["lower"]["cache_hits"] == 0
+    for name in ["upper", "lower"]:
+        assert 0 < stats[name]["p50"] <= stats[name]["p90"] <= stats[name]["p99"]
+        assert stats[name]["total_time"] >= stats[name]["p99"]
+
+
+def test_instrumentation_interpolation_depth(instrumentation: Any) -> None:
+    cfg = OmegaConf.create({"a": 1, "b": "${a}", "c": "${b}", "d": "${c}"})
+    assert cfg.d == 1
+    stats = OmegaConf.get_instrumentation()["interpolations"]
+    assert stats["max_depth"] == 3
+    assert stats["count"] >= 3
+
+
+@pytest.mark.parametrize(  # type: ignore
+    "resolve",
+    [
+        pytest.param(lambda cfg: OmegaConf.resolve(cfg), id="resolve"),
+        pytest.param(
+            lambda cfg: OmegaConf.to_container(cfg, resolve=True), id="to_container"
+        ),
+        pytest.param(
+            lambda cfg: OmegaConf.resolve(cfg, max_workers=2), id="thread_pool"
+        ),
+    ],
+)
+def test_instrumentation_bulk_resolution(
+    restore_resolvers: Any, instrumentation: Any, resolve: Any
+) -> None:
+    OmegaConf.register_resolver("upper", lambda x: x.upper())
+    # resolved in order, d is resolved at depth 3 and c, b are then reused
+    cfg = OmegaConf.create(
+        {"d": "${c}", "c": "${b}", "b": "${a}", "a": 1, "e": "${upper:e}"}
+    )
+    resolve(cfg)
+    stats = OmegaConf.get_instrumentation()["interpolations"]
+    assert stats["max_depth"] == 3
+    assert stats["count"] == 4
+
+
+def test_instrumentation_disabled(restore_resolvers: Any) -> None:
+    OmegaConf.register_resolver("upper", lambda x: x.upper())
+    cfg = OmegaConf.create({"a": "${upper:a}"})
+    assert cfg.a == "A"
+    assert OmegaConf.get_instrumentation() == {}
+    OmegaConf.set_instrumentation(True)
+    OmegaConf.set_instrumentation(False)
+    assert OmegaConf.get_instrumentation() == {}
+
+
 def test_copy_cache(restore_resolvers: Any) -> None:
     OmegaConf.register_resolver("random", lambda _: random.randint(0, 10000000))
     d = {"k": "${random:_}"}
@@ -383,3 +685,265 @@ def test_merge_with_interpolation() -> None:
 
     with pytest.raises(ValidationError):
         OmegaConf.merge(cfg, {"typed_bar": "nope"})
+
+
+@pytest.mark.parametrize(  # type: ignore
+    "value, expected",
+    [
+        ("foo", None),
+        ("${foo", None),
+        ("${foo}", (InterpolationRef(None, "foo"),)),
+        ("${foo.bar}", (InterpolationRef(None, "foo.bar"),)),
+        ("${env:HOME}", (InterpolationRef("env", "HOME"),)),
+        (
+            "http://${host}:${port}/",
+            (
+                "http://",
+                InterpolationRef(None, "host"),
+                ":",
+                InterpolationRef(None, "port"),
+                "/",
+            ),
+        ),
+        ("${a}${b}", (InterpolationRef(None, "a"), InterpolationRef(None, "b"))),
+        ("${foo:bar:baz}", None),
+    ],
+)
+def test_parse_interpolation(value: str, expected: Any) -> None:
+    parsed = parse_interpolation(value)
+    if expected is None:
+        assert parsed is None
+    else:
+        assert parsed is not None
+        assert parsed.segments == expected
+        assert parsed.refs == tuple(
+            x for x in expected if isinstance(x, InterpolationRef)
+        )
+
+
+def test_parse_interpolation_is_cached() -> None:
+    value = "${cached_key}_suffix"
+    assert parse_interpolation(value) is parse_interpolation(value)
+
+
+def test_resolve_in_place() -> None:
+    cfg = OmegaConf.create(
+        {
+            "host": "localhost",
+            "port": 80,
+            "url": "http://${host}:${port}/",
+            "server": {"port": "${port}", "typed_port": IntegerNode("${port}")},
+            "server_copy": "${server}",
+            "list": ["${host}", "${server.port}"],
+        }
+    )
+    OmegaConf.resolve(cfg)
+    assert not OmegaConf.is_interpolation(cfg, "url")
+    assert not OmegaConf.is_interpolation(cfg.server, "port")
+    assert not OmegaConf.is_interpolation(cfg.list, 0)
+    assert cfg == {
+        "host": "localhost",
+        "port": 80,
+        "url": "http://localhost:80/",
+        "server": {"port": 80, "typed_port": 80},
+        "server_copy": {"port": 80, "typed_port": 80},
+        "list": ["localhost", 80],
+    }
+    # the copy is an independent node
+    cfg.server.port = 90
+    assert cfg.server_copy.port == 80
+    assert cfg.server_copy._get_parent() is cfg
+
+
+def test_resolve_in_place_keeps_missing() -> None:
+    cfg = OmegaConf.create({"a": "???", "b": 10, "c": "${b}"})
+    OmegaConf.resolve(cfg)
+    assert OmegaConf.is_missing(cfg, "a")
+    assert cfg.c == 10
+
+    cfg = OmegaConf.create({"a": "???", "b": "${a}"})
+    with pytest.raises(MissingMandatoryValue):
+        OmegaConf.resolve(cfg)
+
+
+def test_resolve_readonly() -> None:
+    cfg = OmegaConf.create({"a": 10, "b": "${a}"})
+    OmegaConf.set_readonly(cfg, True)
+    with pytest.raises(ReadonlyConfigError):
+        OmegaConf.resolve(cfg)
+
+
+def test_resolve_resolver_called_once(restore_resolvers: Any) -> None:
+    calls = []
+
+    def count(x: str) -> str:
+        calls.append(x)
+        return x
+
+    OmegaConf.register_resolver("count", count)
+    cfg = OmegaConf.create(
+        {"base": "${count:foo}", "refs": ["${base}" for _ in range(10)]}
+    )
+    assert OmegaConf.to_container(cfg, resolve=True) == {
+        "base": "foo",
+        "refs": ["foo"] * 10,
+    }
+    assert calls == ["foo"]
+
+
+@pytest.mark.parametrize(  # type: ignore
+    "cfg, cycle",
+    [
+        ({"a": "${a}"}, "a -> a"),
+        ({"a": "${b}", "b": "${a}"}, "a -> b -> a"),
+        ({"a": "x_${b.c}", "b": {"c": "${a}"}}, "a -> b.c -> a"),
+        ({"a": "${b.0}", "b": ["${a}"]}, "a -> b[0] -> a"),
+    ],
+)
+def test_resolve_cycle(cfg: Any, cycle: str) -> None:
+    c = OmegaConf.create(cfg)
+    with pytest.raises(InterpolationCycleError, match=re.escape(cycle)):
+        OmegaConf.resolve(c)
+    with pytest.raises(InterpolationCycleError):
+        OmegaConf.to_container(c, resolve=True)
+
+
+@pytest.mark.parametrize(  # type: ignore
+    "cfg",
+    [
+        {"a": {"b": "${a}"}},
+        {"a": [{"b": "${a}"}]},
+        {"p": {"q": "${r}"}, "r": {"s": "${p}"}},
+        {"x": "${z}", "z": {"w": "${x}"}},
+    ],
+)
+def test_resolve_container_cycle(cfg: Any) -> None:
+    with pytest.raises(InterpolationCycleError):
+        OmegaConf.to_container(OmegaConf.create(cfg), resolve=True)
+    with pytest.raises(InterpolationCycleError):
+        OmegaConf.resolve(OmegaConf.create(cfg))
+
+
+def test_resolved_cache(mocker: Any) -> None:
+    cfg = OmegaConf.create(
+        {"host": "localhost", "url": "http://${host}/", "srv": {"host": "${host}"}}
+    )
+    OmegaConf.set_resolved_cache(cfg, True)
+    spy = mocker.spy(BaseContainer, "_resolve_value")
+    assert cfg.url == "http://localhost/"
+    assert cfg.url == "http://localhost/"
+    assert cfg.srv.host == "localhost"
+    assert cfg.srv.host == "localhost"
+    assert spy.call_count == 2
+
+
+@pytest.mark.parametrize(  # type: ignore
+    "mutate",
+    [
+        pytest.param(lambda cfg: cfg.__setattr__("host", "remote"), id="setattr"),
+        pytest.param(lambda cfg: cfg.merge_with({"host": "remote"}), id="merge"),
+        pytest.param(lambda cfg: cfg.srv.__setitem__("host", "remote"), id="nested"),
+        pytest.param(lambda cfg: cfg.get_node("host")._set_value("remote"), id="node"),
+        pytest.param(
+            lambda cfg: cfg.__setattr__("url", "https://${host}/"), id="replace"
+        ),
+        pytest.param(lambda cfg: cfg.__delitem__("url"), id="delitem"),
+        pytest.param(lambda cfg: cfg.pop("url"), id="pop"),
+    ],
+)
+def test_resolved_cache_invalidation(mutate: Any) -> None:
+    content = {
+        "host": "localhost",
+        "url": "http://${host}/",
+        "srv": {"host": "localhost"},
+    }
+    cfg = OmegaConf.create(content)
+    OmegaConf.set_resolved_cache(cfg, True)
+    expected = OmegaConf.create(content)
+    assert cfg.url == "http://localhost/"
+    mutate(cfg)
+    mutate(expected)
+    assert cfg.get("url", "missing") == expected.get("url", "missing")
+
+
+def test_resolved_cache_uncached_resolver(restore_resolvers: Any) -> None:
+    calls = []
+    OmegaConf.register_resolver(
+        "now", lambda: calls.append(1) or len(calls), use_cache=False
+    )
+    cfg = OmegaConf.create({"now": "${now:}", "at": "t=${now:}", "ref": "${now}"})
+    OmegaConf.set_resolved_cache(cfg, True)
+    assert (cfg.now, cfg.now) == (1, 2)
+    assert (cfg.at, cfg.at) == ("t=3", "t=4")
+    assert (cfg.ref, cfg.ref) == (5, 6)
+
+
+def test_resolved_cache_resolver_ttl(restore_resolvers: Any, mocker: Any) -> None:
+    OmegaConf.register_resolver("id", lambda x: [x], cache_ttl=10)
+    monotonic = mocker.patch("time.monotonic", return_value=100.0)
+    cfg = OmegaConf.create(dict(a="${id:a}"))
+    OmegaConf.set_resolved_cache(cfg, True)
+    a = cfg.a
+    monotonic.return_value = 109.0
+    assert cfg.a is a
+    monotonic.return_value = 110.0
+    assert cfg.a is not a
+
+
+def test_resolved_cache_drops_stale_entries() -> None:
+    cfg = OmegaConf.create({"a": 1, "b": "${a}", "c": "${a}"})
+    OmegaConf.set_resolved_cache(cfg, True)
+    cache = cfg.__dict__["_resolved_cache"]
+    assert isinstance(cache, ResolvedCache)
+    for _ in range(10):
+        cfg.b = "${a}"
+        assert cfg.b == 1
+        assert len(cache.entries) == 1
+    node = cfg.get_node("b")
+    del cfg["b"]
+    assert cfg.c == 1
+    nodes = [entry[0] for entry in cache.entries.values()]
+    assert len(nodes) == 1
+    assert nodes[0] is not node and nodes[0] is cfg.get_node("c")
+
+
+def test_resolved_cache_disabled() -> None:
+    cfg = OmegaConf.create({"a": 1, "b": "${a}"})
+    OmegaConf.set_resolved_cache(cfg, True)
+    assert cfg.b == 1
+    OmegaConf.set_resolved_cache(cfg, False)
+    assert cfg.__dict__["_resolved_cache"] is None
+    assert cfg.b == 1
+
+
+def test_parsed_interpolation_render() -> None:
+    parsed = parse_interpolation("${host}:${port}/${path}")
+    assert parsed is not None
+    values = {"host": "localhost", "port": 80, "path": "index.html"}
+    assert parsed.render(lambda ref: values[ref.inter_key]) == "localhost:80/index.html"
+
+
+def test_str_interpolation_returns_primitive() -> None:
+    cfg = OmegaConf.create({"host": "localhost", "port": 80, "url": "${host}:${port}"})
+    assert isinstance(cfg, DictConfig)
+    value = cfg._resolve_str_interpolation(
+        key="url", value=cfg.get_node("url"), throw_on_missing=True
+    )
+    assert value == "localhost:80"
+    assert type(value) is str
+    # a node is still created when one is needed
+    node = cfg.get_node("url")._dereference_node()
+    assert isinstance(node, StringNode)
+    assert node._value() == "localhost:80"
+    assert node._get_parent() is cfg
+
+
+def test_interpolation_to_str_interpolation() -> None:
+    cfg = OmegaConf.create({"a": "x", "b": "${a}_${a}", "c": "${b}"})
+    assert cfg.c == "x_x"
+    assert cfg.get_node("c")._dereference_node()._value() == "x_x"
+    assert OmegaConf.to_container(cfg, resolve=True) == {
+        "a": "x",
+        "b": "x_x",
+        "c": "x_x",
+    }
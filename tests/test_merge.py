@@ -1,8 +1,17 @@
-from typing import Any, Tuple
+from dataclasses import dataclass, field
+from typing import Any, List, Tuple
 
 import pytest
 
-from omegaconf import MISSING, DictConfig, OmegaConf, ValidationError, _utils, nodes
+from omegaconf import (
+    MISSING,
+    DictConfig,
+    ListConfig,
+    OmegaConf,
+    ValidationError,
+    _utils,
+    nodes,
+)
 from omegaconf.errors import ReadonlyConfigError
 
 from . import ConcretePlugin, ConfWithMissingDict, Group, Plugin, User, Users
@@ -184,3 +193,143 @@ def test_parent_maintained() -> None:
     assert id(c1.a._get_parent()) == id(c1)
     assert id(c2.aa._get_parent()) == id(c2)
     assert id(c3.a._get_parent()) == id(c3)
+
+
+@pytest.mark.parametrize(  # type: ignore
+    "inputs",
+    [
+        [{}, {"a": 1}],
+        [{"a": {"a1": 1, "a2": 2}}, {"a": {"a1": 2}}],
+        [{"a": {"b": {"c": 1, "d": 2}}, "e": 3}, {"a": {"b": {"c": 10}}}],
+        [{"a": {"b": 1}}, {"a": {"c": 2}}, {"a": {"b": 3}, "d": [1, 2]}],
+        [{"a": 1, "b": 2}, {"b": {"c": 3}}],
+        [{"b": {"c": 1}}, {"b": 1}],
+        [{"a": "???"}, {"a": {"b": 1}}],
+        [{"a": None}, {"a": {"b": 1}}],
+        [{"a": "${b}", "b": {"c": 1}}, {"a": {"d": 1}}],
+        [{"list": [1, 2, 3]}, {"list": [4, 5, 6]}],
+        [{"data": 123, "reference": "${data}"}, {"data": 456}],
+        [{"user": User}, {"user": {"name": "Joe"}}],
+        [Users, {"name2user": {"joe": {"name": "joe"}}}],
+        [Plugin, ConcretePlugin],
+    ],
+)
+def test_overlay(inputs: Any) -> None:
+    configs = [OmegaConf.create(c) for c in inputs]
+    expected = OmegaConf.merge(*configs)
+    overlay = OmegaConf.overlay(*configs)
+    assert overlay == expected
+    assert OmegaConf.get_type(overlay) == OmegaConf.get_type(expected)
+    assert OmegaConf.to_container(overlay, resolve=False) == OmegaConf.to_container(
+        expected, resolve=False
+    )
+    # the input configs are not changed
+    for input_i, config in zip(inputs, configs):
+        orig = OmegaConf.to_container(OmegaConf.create(input_i), resolve=False)
+        assert OmegaConf.to_container(config, resolve=False) == orig
+
+
+def test_overlay_primitive_overrides() -> None:
+    base = OmegaConf.create({"a": {"b": 1, "c": 2}})
+    overlay = OmegaConf.overlay(base, {"a": {"b": 10}}, {"a": {"c": 20}})
+    assert overlay == {"a": {"b": 10, "c": 20}}
+
+
+def test_overlay_is_independent() -> None:
+    base = OmegaConf.create({"a": {"b": 1, "c": {"d": 2}}, "x": "${a.b}"})
+    override = OmegaConf.create({"a": {"b": 10}})
+    overlay = OmegaConf.overlay(base, override)
+    base.a.b = 2
+    base.a.c.d = 3
+    override.a.b = 20
+    assert overlay == {"a": {"b": 10, "c": {"d": 2}}, "x": 10}
+    overlay.a.c.d = 4
+    assert base == {"a": {"b": 2, "c": {"d": 3}}, "x": 2}
+    assert override == {"a": {"b": 20}}
+    assert overlay.a.c._get_parent() is overlay.a
+
+
+def test_overlay_validation_error() -> None:
+    base = OmegaConf.structured(ConcretePlugin)
+    overlay = OmegaConf.overlay(base, {"params": {"foo": "bar"}})
+    with pytest.raises(ValidationError):
+        overlay.params.foo
+    with pytest.raises(ValidationError):
+        OmegaConf.overlay(base, {"params": {"foo": 1}}, [1])
+
+
+def test_merge_parents() -> None:
+    c1 = OmegaConf.create({"a": {"b": {"c": 1}, "l": [{"x": 1}]}})
+    c2 = OmegaConf.create({"a": {"b": {"d": {"e": 2}}, "l": [{"y": 2}], "f": {}}})
+    c3 = OmegaConf.merge(c1, c2, {"user": User}, {"user": {"name": "Joe"}})
+
+    def check(node: Any) -> None:
+        for key in node.keys() if isinstance(node, DictConfig) else range(len(node)):
+            child = node.get_node(key)
+            assert child._get_parent() is node
+            if isinstance(child, (DictConfig, ListConfig)):
+                check(child)
+
+    check(c3)
+    assert c3 == {
+        "a": {"b": {"c": 1, "d": {"e": 2}}, "l": [{"y": 2}], "f": {}},
+        "user": {"name": "Joe", "age": MISSING},
+    }
+    # the inputs are not changed
+    assert c2.a.b.d._get_parent() is c2.a.b
+    assert c2 == {"a": {"b": {"d": {"e": 2}}, "l": [{"y": 2}], "f": {}}}
+
+
+@pytest.mark.parametrize(  # type: ignore
+    "inputs",
+    [
+        [{"a": 1}, {"a": 2}, {"a": 3}],
+        [{"a": 1}, {"a": {"b": 1}}, {"a": {"c": 2}}, {"a": 3}],
+        [{"a": {"b": 1}}, {"a": {"b": {"c": 1}}}, {"a": {"b": {"d": 2}}}],
+        [{"a": [1]}, {"a": [2, 3]}, {"a": 1}, {"a": [4]}, {"a": [{"b": 1}]}],
+        [{"a": "???"}, {"a": {"b": 1}}, {"a": {"c": 2}}],
+        [{"a": {"b": 1}}, {"a": "???"}, {"a": {"c": 2}}],
+        [{"a": None}, {"a": {"b": 1}}, {"a": 1}, {"a": {"c": 2}}],
+        [{"a": 1, "b": "${a}"}, {"b": 2}, {"b": "${a}"}, {"a": 3}],
+        [{"a": {"b": 1}}, {"a": "${c}"}, {"a": {"d": 2}}, {"c": {"e": 3}}],
+        [{"user": User}, {"user": {"name": "Joe"}}, {"user": {"age": 10}}],
+        [{"user": {"name": "Joe"}}, {"user": User}, {"user": {"age": 10}}],
+        [{}, Users, {"name2user": {"joe": User}}, {"name2user": {"joe": {"age": 1}}}],
+        [Plugin, {"name": "x"}, ConcretePlugin, {"params": {"foo": 20}}],
+        [ConcretePlugin, {"params": {"foo": 20}}, Plugin, {"name": "y"}],
+    ],
+)
+def test_merge_many(inputs: Any) -> None:
+    configs = [OmegaConf.create(c) for c in inputs]
+    expected = OmegaConf.create(inputs[0])
+    for config in configs[1:]:
+        expected.merge_with(config)
+    merged = OmegaConf.merge(*configs)
+    assert OmegaConf.get_type(merged) == OmegaConf.get_type(expected)
+    assert OmegaConf.to_container(merged, resolve=False) == OmegaConf.to_container(
+        expected, resolve=False
+    )
+    for key in expected.keys():
+        assert OmegaConf.get_type(merged, key) == OmegaConf.get_type(expected, key)
+
+
+def test_merge_with_own_node() -> None:
+    cfg = OmegaConf.create({"a": {"b": {"c": 1}}, "b": {"d": 2}})
+    cfg.merge_with(cfg.a)
+    assert cfg == {"a": {"b": {"c": 1}}, "b": {"c": 1, "d": 2}}
+    cfg.b.merge_with(cfg)
+    assert cfg.b == {"c": 1, "d": 2, "a": {"b": {"c": 1}}, "b": {"c": 1, "d": 2}}
+
+
+def test_merge_into_typed_lists() -> None:
+    @dataclass
+    class Lists:
+        ints: List[int] = MISSING
+        strs: List[str] = field(default_factory=lambda: ["a"])
+
+    cfg = OmegaConf.merge(Lists, {"ints": [1, "2"]}, {"strs": [1, 2]})
+    assert cfg == {"ints": [1, 2], "strs": ["1", "2"]}
+    assert isinstance(cfg.ints.get_node(1), nodes.IntegerNode)
+    assert isinstance(cfg.strs.get_node(0), nodes.StringNode)
+    with pytest.raises(ValidationError):
+        OmegaConf.merge(Lists, {"ints": ["a"]})
@@ -0,0 +1,77 @@
+from typing import Any, List
+
+import pytest
+
+from omegaconf import (
+    MISSING,
+    MergePlan,
+    OmegaConf,
+    ReadonlyConfigError,
+    ValidationError,
+)
+
+from . import ConcretePlugin, User, Users
+
+
+@pytest.mark.parametrize(  # type: ignore
+    "base, overrides",
+    [
+        ({"a": 1, "b": {"c": 2, "d": [1]}}, [{"a": 10}, {"b": {"c": 20}}]),
+        ({"a": 1, "b": {"c": 2}}, [{"b": {"c": {"e": 1}}}, {"b": {"c": {"f": 2}}}]),
+        ({"a": 1, "b": {"c": 2}}, [{"a": {"x": 1}}, {"a": 2}]),
+        ({"a": 1, "b": {"c": 2}}, [{"b": 1, "x": {"y": 1}}, {"b": {"c": 3}}]),
+        ({"a": {"b": [1, 2]}}, [{"a": {"b": [3]}}]),
+        ({"a": "???", "b": {"c": "???"}}, [{"a": {"x": 1}, "b": {"c": 5}}]),
+        ({"a": None, "b": "${a}"}, [{"a": {"x": 1}}, {"b": 2}]),
+        ({"a": 1, "b": "${a}"}, [{"b": "${a}", "a": 5}]),
+        ({"user": User}, [{"user": {"name": "Joe"}}, {"user": {"age": "10"}}]),
+        ({"user": User}, [{"user": User(name="Bond", age=7)}, {"user": {"age": 8}}]),
+        (Users, [{"name2user": {"joe": {"name": "joe"}}}]),
+        (ConcretePlugin, [{"params": {"foo": 20}}, OmegaConf.create({"name": "x"})]),
+    ],
+)
+def test_merge(base: Any, overrides: List[Any]) -> None:
+    base = OmegaConf.create(base)
+    plan = OmegaConf.compile_merge_plan(base)
+    assert isinstance(plan, MergePlan)
+    expected = OmegaConf.merge(base, *overrides)
+    for _ in range(2):
+        merged = plan.merge(*overrides)
+        assert OmegaConf.to_container(merged, resolve=False) == OmegaConf.to_container(
+            expected, resolve=False
+        )
+        assert OmegaConf.get_type(merged) == OmegaConf.get_type(expected)
+        for key in expected.keys():
+            assert OmegaConf.get_type(merged, key) == OmegaConf.get_type(expected, key)
+
+
+def test_merged_configs_are_independent() -> None:
+    base = OmegaConf.create({"a": {"b": 1, "c": 2}})
+    plan = OmegaConf.compile_merge_plan(base)
+    c1 = plan.merge({"a": {"b": 10}})
+    c2 = plan.merge({"a": {"c": 20}})
+    base.a.b = 100
+    c1.a.c = 30
+    assert c1 == {"a": {"b": 10, "c": 30}}
+    assert c2 == {"a": {"b": 1, "c": 20}}
+    assert plan.merge() == {"a": {"b": 1, "c": 2}}
+    assert c1.a._get_parent() is c1
+
+
+def test_validation_error() -> None:
+    plan = OmegaConf.compile_merge_plan(OmegaConf.structured(User))
+    with pytest.raises(ValidationError):
+        plan.merge({"age": "abc"})
+    assert plan.merge({"age": 1}) == {"name": MISSING, "age": 1}
+
+
+def test_struct_and_readonly() -> None:
+    base = OmegaConf.create({"a": {"b": 1}, "ro": {"c": 1}})
+    OmegaConf.set_struct(base, True)
+    OmegaConf.set_readonly(base.ro, True)
+    plan = OmegaConf.compile_merge_plan(base)
+    with pytest.raises(AttributeError):
+        plan.merge({"a": {"x": 1}})
+    with pytest.raises(ReadonlyConfigError):
+        plan.merge({"ro": {"c": 2}})
+    assert plan.merge({"a": {"b": 2}}) == {"a": {"b": 2}, "ro": {"c": 1}}
@@ -1,4 +1,5 @@
 import copy
+import tracemalloc
 from enum import Enum
 from typing import Any, Dict, Tuple, Type
 
@@ -16,9 +17,11 @@ from omegaconf import (
     StringNode,
     ValueNode,
 )
+from omegaconf._utils import ValueKind
+from omegaconf.base import Node
 from omegaconf.errors import ValidationError
 
-from . import Color
+from . import CONTAINER_CACHE_KEYS, Color
 
 
 # testing valid conversions
@@ -434,6 +437,7 @@ def test_node_wrap_illegal_type() -> None:
         BooleanNode(value=True),
         IntegerNode(value=10),
         FloatNode(value=10.0),
+        EnumNode(enum_type=Color, value=Color.RED),
         OmegaConf.create({}),
         OmegaConf.create([]),
         OmegaConf.create({"foo": "foo"}),
@@ -443,9 +447,32 @@ def test_deepcopy(obj: Any) -> None:
     cp = copy.deepcopy(obj)
     assert cp == obj
     assert id(cp) != id(obj)
-    assert obj.__dict__.keys() == cp.__dict__.keys()
-    for k in obj.__dict__.keys():
-        assert obj.__dict__[k] == cp.__dict__[k]
+    if isinstance(obj, ValueNode):
+        # value nodes have no __dict__, their state is in slots
+        for k in ValueNode.__slots__:
+            assert getattr(obj, k) == getattr(cp, k)
+    else:
+        assert obj.__dict__.keys() == cp.__dict__.keys()
+        for k in obj.__dict__.keys() - CONTAINER_CACHE_KEYS:
+            assert obj.__dict__[k] == cp.__dict__[k]
+
+
+def test_deepcopy_flags() -> None:
+    cfg = OmegaConf.create({"a": 1, "b": EnumNode(enum_type=Color, value=Color.RED)})
+    node = cfg.get_node("a")
+    node._set_flag("readonly", True)
+    cp = copy.deepcopy(cfg)
+    cp_node = cp.get_node("a")
+    assert cp_node._get_node_flag("readonly") is True
+    assert cp_node._get_parent() is cp
+    cp_node._set_flag("readonly", False)
+    assert node._get_node_flag("readonly") is True
+    assert cp_node._metadata is not node._metadata
+    cp_enum = cp.get_node("b")
+    assert isinstance(cp_enum, EnumNode)
+    assert cp_enum.enum_type is Color
+    cp.b = "GREEN"
+    assert cfg.b == Color.RED
 
 
 @pytest.mark.parametrize(  # type: ignore
@@ -492,3 +519,80 @@ def test_eq(node: ValueNode, value: Any, expected: Any) -> None:
     assert (value == node) == expected
     assert (value != node) != expected
     assert (node.__hash__() == value.__hash__()) == expected
+
+
+@pytest.mark.parametrize(  # type: ignore
+    "node, values",
+    [
+        (
+            AnyNode(),
+            [
+                (10, ValueKind.VALUE),
+                ("???", ValueKind.MANDATORY_MISSING),
+                ("${foo}", ValueKind.INTERPOLATION),
+                ("http://${foo}", ValueKind.STR_INTERPOLATION),
+                ("foo", ValueKind.VALUE),
+            ],
+        ),
+        (
+            DictConfig(content={}),
+            [
+                ("???", ValueKind.MANDATORY_MISSING),
+                ("${foo}", ValueKind.INTERPOLATION),
+                (None, ValueKind.VALUE),
+                ({"a": 10}, ValueKind.VALUE),
+            ],
+        ),
+        (
+            ListConfig(content=[]),
+            [
+                ("???", ValueKind.MANDATORY_MISSING),
+                ("${foo}", ValueKind.INTERPOLATION),
+                (None, ValueKind.VALUE),
+                ([1, 2], ValueKind.VALUE),
+            ],
+        ),
+    ],
+)
+def test_value_kind_updated_on_set_value(node: Node, values: Any) -> None:
+    for value, kind in values:
+        node._set_value(value)
+        assert node._kind == kind
+
+
+@pytest.mark.parametrize(  # type: ignore
+    "node",
+    [
+        AnyNode(1),
+        StringNode("foo"),
+        IntegerNode(1),
+        FloatNode(1.0),
+        BooleanNode(True),
+        EnumNode(enum_type=Enum1, value=Enum1.FOO),
+    ],
+)
+def test_value_node_compact(node: ValueNode) -> None:
+    assert not hasattr(node, "__dict__")
+    assert node._metadata.flags is None
+
+
+def test_enum_node_fields_shared() -> None:
+    n1 = EnumNode(enum_type=Enum1, value=Enum1.FOO)
+    n2 = EnumNode(enum_type=Enum1, value=Enum1.BAR)
+    assert n1.fields == {"FOO": 1, "BAR": 2}
+    assert n1.fields is n2.fields
+
+
+def test_value_node_memory() -> None:
+    # Allocated memory per leaf of a large config, including its key and value.
+    # About 650 bytes on CPython 3.8 before value nodes used slots, about 330 after.
+    count = 10000
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        cfg = OmegaConf.create({"key_{}".format(i): i for i in range(count)})
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    assert len(cfg) == count
+    assert (after - before) / count < 450
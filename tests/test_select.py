@@ -1,4 +1,6 @@
-from typing import Optional
+import copy
+import pickle
+from typing import Any, Optional
 
 import pytest
 from pytest import raises
@@ -60,3 +62,71 @@ def test_list_select_non_int_key() -> None:
 def test_select_empty_string_returns_root() -> None:
     c = OmegaConf.create({"a": {"v": 1}, "b": {"v": 1}})
     assert c.select("") == c
+
+
+def test_select_with_path_index() -> None:
+    c = OmegaConf.create({"a": {"b": [1, {"c": 2}]}, "d": "${a.b.1.c}"})
+    OmegaConf.set_path_index(c, True)
+    for _ in range(2):
+        assert c.select("a.b.1.c") == 2
+        assert c.select("a.b.0") == 1
+        assert c.select("a.x") is None
+        assert c.select("d") == 2
+    assert "a.b.1.c" in c._path_index.entries
+    # selecting from a nested node does not use the index of the root
+    assert c.a.select("b.1.c") == 2
+    OmegaConf.set_path_index(c, False)
+    assert c._path_index is None
+    assert c.select("a.b.1.c") == 2
+
+
+def test_path_index_value_change_keeps_entries() -> None:
+    c = OmegaConf.create({"a": {"b": 1}})
+    OmegaConf.set_path_index(c, True)
+    assert c.select("a.b") == 1
+    c.a.b = 2
+    assert "a.b" in c._path_index.entries
+    assert c.select("a.b") == 2
+
+
+@pytest.mark.parametrize(  # type: ignore
+    "cfg, mutate, key, expected",
+    [
+        ({"a": [1, 2, 3]}, lambda c: c.a.insert(0, 0), "a.0", 0),
+        ({"a": [1, 2, 3]}, lambda c: c.a.pop(0), "a.0", 2),
+        ({"a": [1, 2, 3]}, lambda c: c.a.__delitem__(0), "a.0", 2),
+        ({"a": {"b": 1}}, lambda c: c.__setattr__("a", {"b": 10}), "a.b", 10),
+        ({"a": {"b": 1}}, lambda c: c.a.__delitem__("b"), "a.b", None),
+        ({"a": {"b": 1}}, lambda c: c.merge_with({"a": {"b": 3}}), "a.b", 3),
+        ({"a": {"b": 1}}, lambda c: c.merge_with({"a": {"x": 3}}), "a.x", 3),
+    ],
+)
+def test_path_index_invalidation(
+    cfg: Any, mutate: Any, key: str, expected: Any
+) -> None:
+    c = OmegaConf.create(cfg)
+    OmegaConf.set_path_index(c, True)
+    c.select(key)
+    mutate(c)
+    assert c.select(key) == expected
+
+
+def test_path_index_update() -> None:
+    c = OmegaConf.create({"a": {"b": {"c": 1}}, "l": [1]})
+    OmegaConf.set_path_index(c, True)
+    assert c.select("a.b") == {"c": 1}
+    c.update_node("a.b.c", 2)
+    c.update_node("a.b.d", 3)
+    assert c.select("a.b") == {"c": 2, "d": 3}
+    c.update_node("l.0.x", 4)
+    assert c.select("l.0.x") == 4
+
+
+def test_path_index_is_not_copied() -> None:
+    c = OmegaConf.create({"a": {"b": 1}})
+    OmegaConf.set_path_index(c, True)
+    c.select("a.b")
+    for c2 in (copy.copy(c), copy.deepcopy(c), pickle.loads(pickle.dumps(c))):
+        assert c2._path_index.entries == {}
+        assert c2.select("a.b") == 1
+        assert c2 == c
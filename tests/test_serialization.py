@@ -1,13 +1,21 @@
 # -*- coding: utf-8 -*-
+import copy
 import io
 import os
 import pathlib
+import pickle
 import tempfile
-from typing import Any, Dict, Type
+from typing import Any, Dict, Iterator, Tuple, Type
 
 import pytest
 
-from omegaconf import Container, OmegaConf
+from omegaconf import Container, DictConfig, EnumNode, OmegaConf, ValueNode
+from omegaconf._pickling import pickle_config
+from omegaconf._utils import ValueKind
+from omegaconf.base import Metadata, Node
+from omegaconf.basecontainer import BaseContainer, LazyContent, PathIndex, ResolvedCache
+
+from . import Color, ConcretePlugin, StructuredWithMissing, Users
 
 
 def save_load_from_file(conf: Container, resolve: bool, expected: Any) -> None:
@@ -105,3 +113,98 @@ def test_pickle_list() -> None:
         fp.seek(0)
         c1 = pickle.load(fp)
         assert c == c1
+
+
+def nodes_of(node: Node) -> Iterator[Tuple[Type[Node], Metadata, ValueKind, Any]]:
+    if isinstance(node, ValueNode):
+        yield type(node), node._metadata, node._kind, getattr(node, "enum_type", None)
+        return
+    assert isinstance(node, BaseContainer)
+    yield type(node), node._metadata, node.__dict__["_kind"], None
+    content = node._materialize()
+    children = content.values() if isinstance(content, dict) else content
+    for child in children if isinstance(content, (dict, list)) else []:
+        assert child._get_parent() is node
+        yield from nodes_of(child)
+
+
+def flags_config() -> DictConfig:
+    cfg = OmegaConf.create({"a": {"b": 1}, "c": [{"d": 2}], "e": 3})
+    OmegaConf.set_struct(cfg, True)
+    OmegaConf.set_readonly(cfg.c, True)
+    cfg.a._set_flag("struct", False)
+    cfg.get_node("e")._set_flag("readonly", True)
+    return cfg
+
+
+@pytest.mark.parametrize(  # type: ignore
+    "cfg",
+    [
+        pytest.param(
+            lambda: OmegaConf.create(
+                {"a": 1, "b": {"c": [1.5, "${a}", {"d": "???"}]}, "e": None}
+            ),
+            id="dict",
+        ),
+        pytest.param(lambda: OmegaConf.create([1, [True, "x_${0}"], None]), id="list"),
+        pytest.param(lambda: OmegaConf.create({"a": "${b}", "b": None}), id="none"),
+        pytest.param(
+            lambda: OmegaConf.create({"a": EnumNode(Color, Color.RED)}), id="enum"
+        ),
+        pytest.param(lambda: OmegaConf.structured(StructuredWithMissing), id="missing"),
+        pytest.param(lambda: OmegaConf.structured(ConcretePlugin), id="structured"),
+        pytest.param(
+            lambda: OmegaConf.merge(Users, {"name2user": {"joe": {"name": "joe"}}}),
+            id="typed_dict",
+        ),
+        pytest.param(flags_config, id="flags"),
+        pytest.param(
+            lambda: copy.deepcopy(OmegaConf.create({"a": {"b": [1]}})), id="copy"
+        ),
+        pytest.param(
+            lambda: OmegaConf.overlay(
+                OmegaConf.create({"a": {"b": 1}}), {"a": {"c": 2}}
+            ),
+            id="overlay",
+        ),
+    ],
+)
+def test_pickle_nodes(cfg: Any) -> None:
+    cfg = cfg()
+    loaded = pickle.loads(pickle.dumps(cfg))
+    assert loaded == cfg
+    assert OmegaConf.get_type(loaded) == OmegaConf.get_type(cfg)
+    assert list(nodes_of(loaded)) == list(nodes_of(cfg))
+    assert loaded._get_root() is loaded
+
+
+def test_pickle_untyped_nodes_are_primitive() -> None:
+    cfg = OmegaConf.create({"a": {"b": [1, "x", None]}, "c": 1.5})
+    content, types = pickle_config(cfg)
+    assert content == {"a": {"b": [1, "x", None]}, "c": 1.5}
+    assert list(types.keys()) == [0]
+
+
+def test_pickle_lazy() -> None:
+    cfg = OmegaConf.create({"a": {"b": 1}}, lazy=True)
+    loaded = pickle.loads(pickle.dumps(cfg))
+    assert isinstance(loaded.__dict__["_content"], LazyContent)
+    assert loaded == cfg
+    assert loaded.a._get_root() is loaded
+
+
+def test_pickle_node() -> None:
+    cfg = OmegaConf.create({"a": {"b": "${c}"}, "c": 10})
+    loaded = pickle.loads(pickle.dumps(cfg.a))
+    assert loaded._key() == "a"
+    assert loaded.b == 10
+    assert loaded._get_parent() == cfg
+
+
+def test_pickle_caches() -> None:
+    cfg = OmegaConf.create({"a": 1})
+    OmegaConf.set_resolved_cache(cfg, True)
+    OmegaConf.set_path_index(cfg, True)
+    loaded = pickle.loads(pickle.dumps(cfg))
+    assert isinstance(loaded.__dict__["_resolved_cache"], ResolvedCache)
+    assert isinstance(loaded.__dict__["_path_index"], PathIndex)